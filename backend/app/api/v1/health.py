@@ -1,9 +1,75 @@
-from fastapi import APIRouter
+import asyncio
+import logging
+
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.metrics import db_pool_connections, db_pool_events_total, db_pool_wait_seconds_total, registry
+from app.core.security import get_monitoring_access
+from app.database.database import async_pool_metrics, get_async_engine, get_engine, pool_metrics
+from app.database.replicas import replica_router
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["health"])
 
+# Pool counters exported as db_pool_events_total{event=...}
+POOL_EVENTS = ("checkouts", "checkins", "connects", "invalidations", "timeouts")
+
+
+def monitored_pools():
+    """(engine, PoolMetrics) pairs for the primary engines and every replica."""
+    return (
+        (get_async_engine(), async_pool_metrics),
+        (get_engine(), pool_metrics),
+        *((replica.engine, replica.metrics) for replica in replica_router.replicas),
+    )
+
+
+def collect_pool_metrics() -> None:
+    """Copy pool counters into the metrics registry at scrape time."""
+    for _, metrics in monitored_pools():
+        snapshot = metrics.snapshot()
+        db_pool_connections.set(snapshot["checked_out"], metrics.name)
+        db_pool_wait_seconds_total.set_total(snapshot["wait_seconds_total"], metrics.name)
+        for event_name in POOL_EVENTS:
+            db_pool_events_total.set_total(snapshot[event_name], metrics.name, event_name)
+
+
+registry.add_collector(collect_pool_metrics)
+
+
+async def ping_database() -> None:
+    async with get_async_engine().connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
 
 @router.get("/health")
 async def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy"}
+    """Health check endpoint. Returns 503 when the database is unreachable."""
+    try:
+        await asyncio.wait_for(ping_database(), timeout=settings.HEALTH_CHECK_TIMEOUT_SECONDS)
+    except Exception as e:
+        logger.warning(f"Health check failed to reach the database: {e}")
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "unhealthy", "database": "unreachable"},
+        )
+    return {"status": "healthy", "database": "ok"}
+
+
+@router.get("/health/pool", dependencies=[Depends(get_monitoring_access)])
+async def pool_stats():
+    """Connection pool checkout and wait-time statistics."""
+    return {
+        metrics.name: {"status": db_engine.pool.status(), **metrics.snapshot()}
+        for db_engine, metrics in monitored_pools()
+    }
+
+
+@router.get("/metrics", response_class=PlainTextResponse, dependencies=[Depends(get_monitoring_access)])
+async def metrics():
+    """Metrics in the Prometheus text exposition format."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
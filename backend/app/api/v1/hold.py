@@ -0,0 +1,122 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from app.schemas.user import SeatHoldCreate, SeatHoldResponse
+from app.database.database import get_async_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.security import get_current_user, Principal
+from app.core.events import seat_events
+from app.core.holds import SeatHold, seat_holds
+from app.core.layout import layout_for_screening
+from app.core.seatmap import seat_maps
+from app.models.user import Screening
+from datetime import datetime
+
+router = APIRouter(prefix="/hold", tags=["hold"])
+
+
+def to_hold_response(hold: SeatHold) -> SeatHoldResponse:
+    """Convert a stored hold to its API representation."""
+    return SeatHoldResponse(
+        hold_id=hold.hold_id,
+        screening_id=hold.screening_id,
+        seat_number=hold.seat_number,
+        expires_at=datetime.utcfromtimestamp(hold.expires_at)
+    )
+
+
+async def get_own_hold(hold_id: str, current_user: Principal) -> SeatHold:
+    """Load an active hold owned by the current user or raise 404."""
+    hold = await seat_holds.get(hold_id)
+    if not hold or hold.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Hold not found or expired"
+        )
+    return hold
+
+
+@router.post("/", response_model=SeatHoldResponse, status_code=status.HTTP_201_CREATED)
+async def create_hold(
+    hold_data: SeatHoldCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Hold a seat while the user completes checkout.
+    The hold expires automatically unless extended or consumed by a booking.
+    """
+    screening = await db.scalar(select(Screening).where(
+        Screening.id == hold_data.screening_id
+    ))
+    
+    if not screening:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Screening not found"
+        )
+    
+    if screening.show_datetime < datetime.utcnow():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot hold seats for past screenings"
+        )
+    
+    seat_number = hold_data.seat_number.upper()
+    layout = layout_for_screening(screening.total_seats)
+    index = layout.index_of(seat_number)
+    if index is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid seat {seat_number}. Use a seat from this screening's layout, like A1, B5, C10"
+        )
+    
+    seat_map = await seat_maps.get(db, screening.id, layout)
+    if seat_map.is_taken(index):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Seat {seat_number} is already reserved"
+        )
+    
+    if await seat_holds.holder_of(screening.id, seat_number) != current_user.id:
+        if await seat_holds.count_for_user(current_user.id) >= seat_holds.max_per_user:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many seats held at once"
+            )
+    
+    hold = await seat_holds.hold(screening.id, seat_number, current_user.id)
+    if hold is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Seat {seat_number} is currently held by another customer"
+        )
+    
+    seat_events.publish(screening.id, taken=[seat_number])
+    
+    return to_hold_response(hold)
+
+
+@router.post("/{hold_id}/extend", response_model=SeatHoldResponse)
+async def extend_hold(
+    hold_id: str,
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Extend a hold by another TTL, up to the maximum hold lifetime.
+    """
+    hold = await get_own_hold(hold_id, current_user)
+    return to_hold_response(await seat_holds.extend(hold))
+
+
+@router.delete("/{hold_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def release_hold(
+    hold_id: str,
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Release a hold before it expires.
+    """
+    hold = await get_own_hold(hold_id, current_user)
+    await seat_holds.release(hold)
+    seat_events.publish(hold.screening_id, available=[hold.seat_number])
+    return None
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, Query
+from app.schemas.user import JobRunResponse, ScheduledJobResponse
+from app.database.database import get_async_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.security import get_current_admin_user, Principal
+from app.models.user import JobRun, ScheduledJob
+from typing import List, Optional
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.get("/", response_model=List[ScheduledJobResponse])
+async def get_jobs(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    """
+    List background jobs with their next run time and current lease.
+    Admin only.
+    """
+    result = await db.scalars(select(ScheduledJob).order_by(ScheduledJob.name))
+    return result.all()
+
+
+@router.get("/runs", response_model=List[JobRunResponse])
+async def get_job_runs(
+    job_name: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    """
+    Recent background job runs, newest first.
+    Admin only.
+    """
+    query = select(JobRun)
+    if job_name is not None:
+        query = query.where(JobRun.job_name == job_name)
+    
+    result = await db.scalars(query.order_by(JobRun.started_at.desc(), JobRun.id.desc()).limit(limit))
+    return result.all()
@@ -0,0 +1,158 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from app.schemas.user import MoviesAdd, MoviesResponse, MovieWithScreeningsResponse, UpcomingScreeningResponse
+from app.database.database import get_async_db
+from app.database.replicas import get_read_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import MOVIES, SCREENINGS, CachedResponse, catalog_cache
+from app.core.config import settings
+from app.core.pagination import parse_id_list
+from app.core.security import get_current_admin_user, Principal
+from app.models.user import Movie, Screening
+from datetime import datetime
+from typing import List, Optional
+
+router = APIRouter(prefix="/movies", tags=["movies"])
+
+
+async def attach_upcoming_screenings(
+    db: AsyncSession,
+    movies: List[Movie]
+) -> List[MovieWithScreeningsResponse]:
+    """
+    Load upcoming screenings with remaining seats for all movies at once.
+    One query regardless of how many movies are listed.
+    """
+    if not movies:
+        return []
+    
+    # Remaining seats come from the maintained seats_taken counter, so the
+    # reservations table is never touched
+    result = await db.scalars(
+        select(Screening)
+        .where(
+            Screening.movie_id.in_([movie.id for movie in movies]),
+            Screening.show_datetime >= datetime.utcnow()
+        )
+        .order_by(Screening.movie_id, Screening.show_datetime, Screening.id)
+    )
+    
+    screenings_by_movie = {}
+    for screening in result:
+        screenings_by_movie.setdefault(screening.movie_id, []).append(UpcomingScreeningResponse(
+            id=screening.id,
+            show_datetime=screening.show_datetime,
+            hall=screening.hall,
+            total_seats=screening.total_seats,
+            price=screening.price,
+            seats_remaining=max(screening.total_seats - screening.seats_taken, 0)
+        ))
+    
+    return [
+        MovieWithScreeningsResponse.model_validate(movie).model_copy(
+            update={"screenings": screenings_by_movie.get(movie.id, [])}
+        )
+        for movie in movies
+    ]
+
+
+@router.get("/", response_model=List[MovieWithScreeningsResponse])
+async def get_all_movies(
+    genre: Optional[str] = None,
+    ids: Optional[str] = None,
+    if_none_match: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get all movies with their upcoming screenings and remaining seats.
+    Public endpoint. Pass `ids` (comma-separated) to fetch many movies by id
+    in one request. Responses are cached briefly and carry an ETag.
+    """
+    try:
+        movie_ids = parse_id_list(ids, settings.BATCH_LOOKUP_MAX_IDS)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"ids must be a comma-separated list of at most {settings.BATCH_LOOKUP_MAX_IDS} integers"
+        )
+    
+    async def load() -> CachedResponse:
+        query = select(Movie).order_by(Movie.title, Movie.id)
+        if genre:
+            query = query.where(Movie.genre == genre)
+        if movie_ids is not None:
+            query = query.where(Movie.id.in_(movie_ids))
+        
+        result = await db.scalars(query)
+        return CachedResponse.build(await attach_upcoming_screenings(db, result.all()))
+    
+    cached = await catalog_cache.get_or_load((MOVIES, "list", genre, tuple(sorted(movie_ids)) if movie_ids is not None else None), load)
+    return cached.to_response(if_none_match)
+
+
+@router.get("/{movie_id}", response_model=MovieWithScreeningsResponse)
+async def get_movie_by_id(
+    movie_id: int,
+    if_none_match: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get a specific movie with its upcoming screenings and remaining seats.
+    Public endpoint.
+    """
+    async def load() -> CachedResponse:
+        movie = await db.scalar(select(Movie).where(Movie.id == movie_id))
+        if not movie:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Movie not found"
+            )
+        
+        movies = await attach_upcoming_screenings(db, [movie])
+        return CachedResponse.build(movies[0])
+    
+    cached = await catalog_cache.get_or_load((MOVIES, movie_id), load)
+    return cached.to_response(if_none_match)
+
+
+@router.post("/", response_model=MoviesResponse, status_code=status.HTTP_201_CREATED)
+async def create_movie(
+    movie: MoviesAdd,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    """
+    Create a new movie.
+    Admin only.
+    """
+    db_movie = Movie(**movie.model_dump())
+    db.add(db_movie)
+    await db.commit()
+    await db.refresh(db_movie)
+    catalog_cache.invalidate(MOVIES)
+    
+    return db_movie
+
+
+@router.delete("/{movie_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_movie(
+    movie_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    """
+    Delete a movie and its screenings.
+    Admin only.
+    """
+    movie = await db.scalar(select(Movie).where(Movie.id == movie_id))
+    if not movie:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Movie not found"
+        )
+    
+    await db.delete(movie)
+    await db.commit()
+    catalog_cache.invalidate(MOVIES, SCREENINGS)
+    
+    return None
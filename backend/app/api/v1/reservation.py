@@ -1,22 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import Response, StreamingResponse
 from app.schemas.user import (
     ReservationCreate, 
     ReservationResponse, 
     ReservationListResponse,
+    ExpandedReservationResponse,
+    GroupReservationCreate,
+    GroupReservationResponse,
+    MoviesResponse,
+    ScreeningResponse,
     PaymentResponse
 )
-from app.database.database import get_db
-from sqlalchemy.orm import Session
-from app.core.security import get_current_user
+from app.database.database import AsyncSessionLocal, get_async_db
+from app.database.replicas import get_read_db
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.security import get_current_user, Principal
+from app.core.allocation import allocate_best_seats, allocation_lock
+from app.core.counters import adjust_seats_taken
+from app.core.events import seat_events
+from app.core.holds import seat_holds
+from app.core.layout import layout_for_screening
+from app.core.pagination import after_key, encode_cursor
+from app.core.seatmap import seat_maps
+from app.core.tickets import (
+    TicketData,
+    ZipStreamBuffer,
+    generate_tickets_pdf,
+    render_ticket,
+    ticket_cache,
+    ticket_pool
+)
+from app.core.metrics import bookings_total
+from app.core.workers import WorkerPoolSaturated
 from app.models.user import User, Screening, Reservation, Movie
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 from decimal import Decimal
 import uuid
 import re
-import io
-from fpdf import FPDF
+import zipfile
 
 router = APIRouter(prefix="/reservation", tags=["reservation"])
 
@@ -55,20 +80,72 @@ def process_fake_payment(card_number: str, amount: Decimal) -> PaymentResponse:
     )
 
 
-@router.post("/", response_model=ReservationResponse, status_code=status.HTTP_201_CREATED)
-async def create_reservation(
-    reservation_data: ReservationCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
+def describe_seats(seat_numbers: List[str]) -> str:
+    """Human-readable seat list for error messages."""
+    if len(seat_numbers) == 1:
+        return f"Seat {seat_numbers[0]} is"
+    return f"Seats {', '.join(seat_numbers)} are"
+
+
+async def claim_seats(
+    db: AsyncSession,
+    screening_id: int,
+    seat_numbers: List[str],
+    user_id: int
+) -> tuple[List[Reservation], List[str]]:
     """
-    Create a new reservation with fake payment.
-    Requires authentication.
+    Claim all seats in one insert; the unique active-seat index rejects
+    concurrent buyers of any of them atomically.
+    Returns the committed reservations, or no reservations and the seats
+    that lost the race (the transaction is rolled back).
+    """
+    reservations = [
+        Reservation(
+            screening_id=screening_id,
+            user_id=user_id,
+            seat_number=seat,
+            status="active"
+        )
+        for seat in seat_numbers
+    ]
+    
+    db.add_all(reservations)
+    try:
+        await db.flush()
+        # Keep the screening's counter in step within the same transaction
+        await db.execute(adjust_seats_taken(screening_id, len(reservations)))
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        if len(seat_numbers) == 1:
+            return [], seat_numbers
+        # Find out which seats lost the race (error path only)
+        result = await db.scalars(select(Reservation.seat_number).where(
+            Reservation.screening_id == screening_id,
+            Reservation.seat_number.in_(seat_numbers),
+            Reservation.status == "active"
+        ))
+        return [], list(result.all()) or seat_numbers
+    return reservations, []
+
+
+async def book_seats(
+    db: AsyncSession,
+    screening_id: int,
+    seat_numbers: Optional[List[str]],
+    card_number: str,
+    current_user: Principal,
+    seat_count: Optional[int] = None
+) -> tuple[List[Reservation], PaymentResponse]:
+    """
+    Reserve one or more seats in a single transaction with a single payment.
+    Either every seat is booked or none is. Without seat_numbers, the best
+    seat_count adjacent seats are allocated automatically.
     """
     # Check if screening exists
-    screening = db.query(Screening).filter(
-        Screening.id == reservation_data.screening_id
-    ).first()
+    screening = await db.scalar(select(Screening).where(
+        Screening.id == screening_id
+    ))
     
     if not screening:
         raise HTTPException(
@@ -83,56 +160,124 @@ async def create_reservation(
             detail="Cannot reserve seats for past screenings"
         )
     
-    # Check if seat is already reserved
-    existing_reservation = db.query(Reservation).filter(
-        Reservation.screening_id == reservation_data.screening_id,
-        Reservation.seat_number == reservation_data.seat_number,
-        Reservation.status == "active"
-    ).first()
-    
-    if existing_reservation:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=f"Seat {reservation_data.seat_number} is already reserved"
+    # Validate the seats against the hall layout (e.g., A1, B10, etc.). Seats
+    # outside the layout can never be booked, so together with the unique
+    # active-seat index this also enforces the screening capacity.
+    layout = layout_for_screening(screening.total_seats)
+    auto_allocated = seat_numbers is None
+    if auto_allocated:
+        seat_numbers = await allocate_best_seats(
+            db, screening_id, layout, seat_count, current_user.id
         )
-    
-    # Check seat capacity - count active reservations
-    active_reservation_count = db.query(Reservation).filter(
-        Reservation.screening_id == reservation_data.screening_id,
-        Reservation.status == "active"
-    ).count()
-    
-    if active_reservation_count >= screening.total_seats:
+        if seat_numbers is None:
+            bookings_total.inc("no_adjacent_seats")
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"No {seat_count} adjacent seats are available for this screening"
+            )
+    seat_numbers = list(dict.fromkeys(seat.upper() for seat in seat_numbers))
+    indices = {seat: layout.index_of(seat) for seat in seat_numbers}
+    invalid = [seat for seat, index in indices.items() if index is None]
+    if invalid:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="This screening is fully booked"
+            detail=f"Invalid seat {', '.join(invalid)}. Use a seat from this screening's layout, like A1, B5, C10"
         )
     
-    # Validate seat number format (e.g., A1, B10, etc.)
-    seat_pattern = re.compile(r'^[A-Z]\d{1,2}$')
-    if not seat_pattern.match(reservation_data.seat_number.upper()):
+    # Reject seats already known to be taken before charging the card
+    seat_map = seat_maps.peek(screening_id)
+    if seat_map is not None:
+        taken = [seat for seat, index in indices.items() if seat_map.is_taken(index)]
+        if taken:
+            bookings_total.inc("seat_taken")
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"{describe_seats(taken)} already reserved"
+            )
+    
+    held_by_others = await seat_holds.held_by_others(screening_id, current_user.id)
+    held = [seat for seat in seat_numbers if seat in held_by_others]
+    if held:
+        bookings_total.inc("seat_held")
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid seat number format. Use format like A1, B5, C10"
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"{describe_seats(held)} currently held by another customer"
         )
     
-    # Process fake payment
+    # Process fake payment once for the whole booking
     payment_response = process_fake_payment(
-        reservation_data.payment.card_number,
-        screening.price
+        card_number,
+        screening.price * len(seat_numbers)
     )
     
-    # Create reservation
-    db_reservation = Reservation(
-        screening_id=reservation_data.screening_id,
-        user_id=current_user.id,
-        seat_number=reservation_data.seat_number,
-        status="active"
+    # Seats the customer picked are reported back when a concurrent booking
+    # takes them first. Automatically allocated seats are re-allocated around
+    # the lost ones instead; retries take a per-screening lock so concurrent
+    # losers pick their runs one after another rather than colliding again.
+    reservations, taken = await claim_seats(db, screening_id, seat_numbers, current_user.id)
+    if taken and not auto_allocated:
+        for seat in taken:
+            seat_maps.mark_taken(screening_id, layout.index_of(seat))
+        bookings_total.inc("lost_race")
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"{describe_seats(taken)} already reserved"
+        )
+    lost = set()
+    attempts = 1
+    while taken:
+        for seat in taken:
+            seat_maps.mark_taken(screening_id, layout.index_of(seat))
+            lost.add(layout.index_of(seat))
+        if attempts == settings.GROUP_BOOKING_ALLOCATION_ATTEMPTS:
+            bookings_total.inc("lost_race")
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Could not reserve {seat_count} adjacent seats due to concurrent bookings, please try again"
+            )
+        attempts += 1
+        async with allocation_lock(screening_id):
+            seat_numbers = await allocate_best_seats(
+                db, screening_id, layout, seat_count, current_user.id, excluded=lost
+            )
+            if seat_numbers is None:
+                bookings_total.inc("no_adjacent_seats")
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"No {seat_count} adjacent seats are available for this screening"
+                )
+            reservations, taken = await claim_seats(db, screening_id, seat_numbers, current_user.id)
+            if not taken:
+                for seat in seat_numbers:
+                    seat_maps.mark_taken(screening_id, layout.index_of(seat))
+    
+    for seat in seat_numbers:
+        seat_maps.mark_taken(screening_id, layout.index_of(seat))
+        await seat_holds.release_seat(screening_id, seat, current_user.id)
+    seat_events.publish(screening_id, taken=seat_numbers)
+    bookings_total.inc("booked")
+    
+    return reservations, payment_response
+
+
+@router.post("/", response_model=ReservationResponse, status_code=status.HTTP_201_CREATED)
+async def create_reservation(
+    reservation_data: ReservationCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Create a new reservation with fake payment.
+    Requires authentication.
+    """
+    reservations, payment_response = await book_seats(
+        db,
+        reservation_data.screening_id,
+        [reservation_data.seat_number],
+        reservation_data.payment.card_number,
+        current_user
     )
-    
-    db.add(db_reservation)
-    db.commit()
-    db.refresh(db_reservation)
+    db_reservation = reservations[0]
     
     # Return response with payment info
     return ReservationResponse(
@@ -147,37 +292,228 @@ async def create_reservation(
     )
 
 
-@router.get("/", response_model=List[ReservationListResponse])
+@router.post("/group", response_model=GroupReservationResponse, status_code=status.HTTP_201_CREATED)
+async def create_group_reservation(
+    reservation_data: GroupReservationCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Reserve several seats for one screening with a single payment.
+    All seats are booked together or not at all.
+    """
+    seat_numbers = reservation_data.seat_numbers
+    seat_count = reservation_data.seat_count
+    if (seat_numbers is None) == (seat_count is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide either seat_numbers or seat_count"
+        )
+    
+    requested = len(seat_numbers) if seat_numbers is not None else seat_count
+    if requested > settings.GROUP_BOOKING_MAX_SEATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A group booking can include at most {settings.GROUP_BOOKING_MAX_SEATS} seats"
+        )
+    
+    reservations, payment_response = await book_seats(
+        db,
+        reservation_data.screening_id,
+        seat_numbers,
+        reservation_data.payment.card_number,
+        current_user,
+        seat_count=seat_count
+    )
+    
+    return GroupReservationResponse(
+        reservations=reservations,
+        payment_info=payment_response
+    )
+
+
+RESERVATION_EXPANSIONS = {"screening", "movie"}
+
+
+@router.get("/", response_model=List[ExpandedReservationResponse])
 async def get_my_reservations(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    expand: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Get all reservations for the current user.
+    Pass `expand=screening,movie` to include each reservation's screening
+    and movie inline, loaded with the reservations in one joined query.
     """
-    reservations = db.query(Reservation).filter(
+    expansions = {part.strip() for part in expand.split(",") if part.strip()} if expand else set()
+    unknown = expansions - RESERVATION_EXPANSIONS
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown expansion {', '.join(sorted(unknown))}. Use screening, movie"
+        )
+    
+    query = select(Reservation)
+    if expansions:
+        # Screenings or movies may have been deleted, so keep outer joins
+        query = (
+            select(Reservation, Screening, Movie)
+            .outerjoin(Screening, Screening.id == Reservation.screening_id)
+            .outerjoin(Movie, Movie.id == Screening.movie_id)
+        )
+    query = query.where(
         Reservation.user_id == current_user.id
-    ).offset(skip).limit(limit).all()
+    ).order_by(Reservation.id).offset(skip).limit(limit)
+    
+    if not expansions:
+        result = await db.scalars(query)
+        return result.all()
+    
+    result = await db.execute(query)
+    return [
+        ExpandedReservationResponse.model_validate(reservation).model_copy(update={
+            "screening": ScreeningResponse.model_validate(screening)
+            if screening is not None and "screening" in expansions else None,
+            "movie": MoviesResponse.model_validate(movie)
+            if movie is not None and "movie" in expansions else None,
+        })
+        for reservation, screening, movie in result
+    ]
+
+
+# Tickets read per short-lived session while streaming a ZIP export
+TICKET_EXPORT_BATCH_SIZE = 100
+
+
+def ticket_export_query(current_user: Principal, screening_id: Optional[int]):
+    """
+    Joined query for exportable tickets.
+    Admins exporting a screening get every active ticket for it; everyone
+    else only gets their own.
+    """
+    query = (
+        select(Reservation, Screening, Movie, User.email)
+        .join(Screening, Screening.id == Reservation.screening_id)
+        .outerjoin(Movie, Movie.id == Screening.movie_id)
+        .join(User, User.id == Reservation.user_id)
+        .where(Reservation.status == "active")
+        .order_by(Screening.show_datetime, Reservation.id)
+    )
+    if screening_id is not None:
+        query = query.where(Reservation.screening_id == screening_id)
+    if screening_id is None or current_user.role != "admin":
+        query = query.where(Reservation.user_id == current_user.id)
+    return query
+
+
+@router.get("/tickets/export")
+async def export_tickets(
+    format: str = Query(default="zip", pattern="^(zip|pdf)$"),
+    screening_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Export many tickets at once.
+    Without screening_id, exports all of the user's active tickets; admins can
+    pass screening_id to export every ticket for that screening (box office).
+    format=zip streams one PDF per ticket; format=pdf returns a single
+    multi-page PDF and is capped at TICKET_EXPORT_MAX_PDF_PAGES tickets.
+    """
+    query = ticket_export_query(current_user, screening_id)
+    
+    if format == "pdf":
+        limit = settings.TICKET_EXPORT_MAX_PDF_PAGES
+        rows = (await db.execute(query.limit(limit + 1))).all()
+        if not rows:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No tickets to export"
+            )
+        if len(rows) > limit:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Too many tickets for a single PDF (max {limit}); use format=zip"
+            )
+        tickets = [TicketData.from_rows(*row) for row in rows]
+        # Rendering needs no database access; return the connection first
+        await db.close()
+        try:
+            pdf_bytes = await ticket_pool.run(generate_tickets_pdf, tickets)
+        except WorkerPoolSaturated:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Ticket rendering is busy, please retry shortly",
+                headers={"Retry-After": "1"}
+            )
+        return Response(
+            content=pdf_bytes,
+            media_type="application/pdf",
+            headers={"Content-Disposition": "attachment; filename=tickets.pdf"}
+        )
     
-    return reservations
+    async def zip_stream():
+        # Rows are read in short keyset-paged batches and each PDF is flushed to
+        # the client as soon as it is added, so memory stays flat regardless of
+        # export size and no connection is held while tickets render.
+        buffer = ZipStreamBuffer()
+        cursor = None
+        with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED) as archive:
+            while True:
+                batch = query.limit(TICKET_EXPORT_BATCH_SIZE)
+                after_cursor = after_key(Screening.show_datetime, Reservation.id, cursor)
+                if after_cursor is not None:
+                    batch = batch.where(after_cursor)
+                async with AsyncSessionLocal() as session:
+                    rows = (await session.execute(batch)).all()
+                if not rows:
+                    break
+                for row in rows:
+                    ticket = TicketData.from_rows(*row)
+                    # Headers are already sent, so wait for a worker rather than fail
+                    archive.writestr(
+                        f"ticket_RES-{ticket.reservation_id:06d}.pdf",
+                        await render_ticket(ticket, wait=True)
+                    )
+                    yield buffer.drain()
+                reservation, screening = rows[-1][:2]
+                cursor = encode_cursor(screening.show_datetime, reservation.id)
+        yield buffer.drain()
+    
+    # The export reads through its own sessions; release the request's one now
+    await db.close()
+    
+    if ticket_pool.full:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Ticket rendering is busy, please retry shortly",
+            headers={"Retry-After": "1"}
+        )
+    
+    return StreamingResponse(
+        zip_stream(),
+        media_type="application/zip",
+        headers={"Content-Disposition": "attachment; filename=tickets.zip"}
+    )
 
 
 @router.get("/{reservation_id}", response_model=ReservationListResponse)
 async def get_reservation(
     reservation_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Get a specific reservation by ID.
     Users can only view their own reservations.
     """
-    reservation = db.query(Reservation).filter(
+    reservation = await db.scalar(select(Reservation).where(
         Reservation.id == reservation_id,
         Reservation.user_id == current_user.id
-    ).first()
+    ))
     
     if not reservation:
         raise HTTPException(
@@ -191,164 +527,114 @@ async def get_reservation(
 @router.post("/{reservation_id}/cancel", response_model=ReservationListResponse)
 async def cancel_reservation(
     reservation_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Cancel a reservation.
     Users can only cancel their own reservations.
     """
-    reservation = db.query(Reservation).filter(
-        Reservation.id == reservation_id,
-        Reservation.user_id == current_user.id
-    ).first()
-    
-    if not reservation:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Reservation not found"
+    # Flip the status in one conditional update so concurrent cancels of the
+    # same reservation cannot both succeed.
+    reservation = await db.scalar(
+        update(Reservation)
+        .where(
+            Reservation.id == reservation_id,
+            Reservation.user_id == current_user.id,
+            Reservation.status == "active"
         )
+        .values(status="cancelled", cancelled_at=datetime.utcnow())
+        .returning(Reservation)
+    )
     
-    if reservation.status == "cancelled":
+    if not reservation:
+        existing = await db.scalar(select(Reservation.status).where(
+            Reservation.id == reservation_id,
+            Reservation.user_id == current_user.id
+        ))
+        if existing is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Reservation not found"
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Reservation is already cancelled"
         )
     
-    # Update reservation status
-    reservation.status = "cancelled"
-    reservation.cancelled_at = datetime.utcnow()
+    await db.execute(adjust_seats_taken(reservation.screening_id, -1))
+    await db.commit()
     
-    db.commit()
-    db.refresh(reservation)
+    seat_maps.release(reservation.screening_id, reservation.seat_number)
+    ticket_cache.invalidate(reservation.id)
+    seat_events.publish(reservation.screening_id, available=[reservation.seat_number])
     
     return reservation
 
 
-def generate_ticket_pdf(reservation, screening, movie, user_email: str) -> bytes:
-    """Generate a PDF ticket for a reservation."""
-    pdf = FPDF()
-    pdf.add_page()
-    
-    # Header
-    pdf.set_font("Helvetica", "B", 24)
-    pdf.set_text_color(0, 102, 204)
-    pdf.cell(0, 20, "MOVIE TICKET", align="C", ln=True)
-    
-    # Divider line
-    pdf.set_draw_color(0, 102, 204)
-    pdf.set_line_width(1)
-    pdf.line(20, 35, 190, 35)
-    
-    pdf.ln(10)
-    
-    # Ticket details
-    pdf.set_font("Helvetica", "B", 14)
-    pdf.set_text_color(0, 0, 0)
-    movie_title = movie.title if movie else "Unknown Movie"
-    pdf.cell(0, 10, "Movie: " + movie_title, ln=True)
-    
-    pdf.set_font("Helvetica", "", 12)
-    movie_genre = movie.genre if movie else "N/A"
-    pdf.cell(0, 8, "Genre: " + movie_genre, ln=True)
-    
-    pdf.ln(5)
-    pdf.set_font("Helvetica", "B", 12)
-    pdf.cell(0, 8, "Screening Details:", ln=True)
-    
-    pdf.set_font("Helvetica", "", 12)
-    show_date = screening.show_datetime.strftime("%B %d, %Y")
-    show_time = screening.show_datetime.strftime("%I:%M %p")
-    pdf.cell(0, 8, "Date: " + show_date, ln=True)
-    pdf.cell(0, 8, "Time: " + show_time, ln=True)
-    
-    pdf.ln(5)
-    pdf.set_font("Helvetica", "B", 16)
-    pdf.set_text_color(0, 128, 0)
-    pdf.cell(0, 10, "SEAT: " + reservation.seat_number, ln=True)
-    
-    pdf.set_text_color(0, 0, 0)
-    pdf.set_font("Helvetica", "", 12)
-    pdf.cell(0, 8, "Price: $" + str(screening.price), ln=True)
-    
-    pdf.ln(10)
-    
-    # Booking details box
-    pdf.set_fill_color(240, 240, 240)
-    pdf.rect(20, pdf.get_y(), 170, 35, "F")
-    
-    pdf.set_font("Helvetica", "B", 10)
-    pdf.set_xy(25, pdf.get_y() + 5)
-    pdf.cell(0, 6, "BOOKING INFORMATION", ln=True)
-    
-    pdf.set_font("Helvetica", "", 10)
-    pdf.set_x(25)
-    pdf.cell(0, 6, "Booking ID: RES-" + str(reservation.id).zfill(6), ln=True)
-    pdf.set_x(25)
-    pdf.cell(0, 6, "Email: " + user_email, ln=True)
-    pdf.set_x(25)
-    booked_date = reservation.created_at.strftime("%Y-%m-%d %H:%M") if reservation.created_at else "N/A"
-    pdf.cell(0, 6, "Booked on: " + booked_date, ln=True)
-    
-    pdf.ln(20)
-    
-    # Footer
-    pdf.set_font("Helvetica", "I", 10)
-    pdf.set_text_color(128, 128, 128)
-    pdf.cell(0, 6, "Please present this ticket at the entrance.", align="C", ln=True)
-    pdf.cell(0, 6, "Thank you for choosing our cinema!", align="C", ln=True)
-    
-    # fpdf 1.7.x: output(dest='S') returns a string, encode to bytes
-    pdf_content = pdf.output(dest='S')
-    if isinstance(pdf_content, str):
-        return pdf_content.encode('latin-1')
-    return pdf_content
-
-
 @router.get("/{reservation_id}/ticket")
 async def download_ticket(
     reservation_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    if_none_match: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Download a PDF ticket for a reservation.
     Users can only download tickets for their own active reservations.
+    Supports If-None-Match so re-downloads of an unchanged ticket return 304.
     """
-    reservation = db.query(Reservation).filter(
-        Reservation.id == reservation_id,
-        Reservation.user_id == current_user.id
-    ).first()
+    # Load reservation, screening and movie in one round trip
+    row = (await db.execute(
+        select(Reservation, Screening, Movie)
+        .join(Screening, Screening.id == Reservation.screening_id)
+        .outerjoin(Movie, Movie.id == Screening.movie_id)
+        .where(
+            Reservation.id == reservation_id,
+            Reservation.user_id == current_user.id
+        )
+    )).first()
     
-    if not reservation:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Reservation not found"
         )
     
+    reservation, screening, movie = row
+    
     if reservation.status == "cancelled":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot download ticket for cancelled reservation"
         )
     
-    # Get screening and movie details
-    screening = db.query(Screening).filter(
-        Screening.id == reservation.screening_id
-    ).first()
-    
-    movie = db.query(Movie).filter(
-        Movie.id == screening.movie_id
-    ).first()
-    
-    # Generate PDF
-    pdf_bytes = generate_ticket_pdf(reservation, screening, movie, current_user.email)
+    ticket = TicketData.from_rows(reservation, screening, movie, current_user.email)
+    # Rendering needs no database access; return the connection first
+    await db.close()
+    etag = f'"{ticket.digest}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, no-cache",
+        "Content-Disposition": f"attachment; filename=ticket_RES-{reservation.id:06d}.pdf"
+    }
+    
+    if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    # Serve from the ticket cache, rendering off the event loop on a miss
+    try:
+        pdf_bytes = await render_ticket(ticket)
+    except WorkerPoolSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Ticket rendering is busy, please retry shortly",
+            headers={"Retry-After": "1"}
+        )
     
     # Return PDF as downloadable file
     return Response(
         content=pdf_bytes,
         media_type="application/pdf",
-        headers={
-            "Content-Disposition": f"attachment; filename=ticket_RES-{reservation.id:06d}.pdf"
-        }
+        headers=headers
     )
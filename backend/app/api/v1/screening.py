@@ -1,121 +1,304 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from app.schemas.user import ScreeningAdd, ScreeningResponse, SeatAvailabilityResponse
-from app.database.database import get_db
-from sqlalchemy.orm import Session
-from app.core.security import get_current_user, get_current_admin_user
-from app.models.user import User, Movie, Screening, Reservation
-from typing import List
+import asyncio
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from app.schemas.user import ScreeningAdd, ScreeningResponse, SeatAvailabilityResponse, BestSeatsResponse
+from app.database.database import get_async_db
+from app.database.replicas import get_read_db
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.security import get_current_user, get_current_admin_user, Principal
+from app.core.allocation import allocate_best_seats
+from app.core.cache import MOVIES, SCREENINGS, CachedResponse, catalog_cache
+from app.core.config import settings
+from app.core.events import format_sse, seat_events
+from app.core.holds import seat_holds
+from app.core.layout import layout_for_screening
+from app.core.pagination import NEXT_CURSOR_HEADER, after_key, encode_cursor, parse_id_list
+from app.core.seatmap import seat_maps
+from app.models.user import Movie, Screening, Reservation
+from typing import List, Optional
+from datetime import datetime, timezone
 
 router = APIRouter(prefix="/screening", tags=["screening"])
 
 
 @router.get("/", response_model=List[ScreeningResponse])
 async def get_all_screenings(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    movie_id: Optional[int] = None,
+    genre: Optional[str] = None,
+    upcoming: bool = False,
+    ids: Optional[str] = None,
+    if_none_match: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
-    Get all screenings.
+    Get screenings ordered by show time.
     Available to all authenticated users.
+    
+    Results are paginated with a cursor: when more screenings match, the
+    X-Next-Cursor response header holds the value to pass as `cursor` for
+    the next page. Filter by date range (`start`/`end`), `movie_id`, `genre`,
+    or `upcoming` to only list future screenings. Pass `ids` (comma-separated)
+    to fetch many screenings by id in one request. Responses are cached
+    briefly and carry an ETag for conditional requests.
     """
-    screenings = db.query(Screening).offset(skip).limit(limit).all()
-    return screenings
+    try:
+        after_cursor = after_key(Screening.show_datetime, Screening.id, cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    
+    try:
+        screening_ids = parse_id_list(ids, settings.BATCH_LOOKUP_MAX_IDS)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"ids must be a comma-separated list of at most {settings.BATCH_LOOKUP_MAX_IDS} integers"
+        )
+    
+    # Show times are stored as naive UTC
+    start, end = (
+        value.astimezone(timezone.utc).replace(tzinfo=None) if value and value.tzinfo else value
+        for value in (start, end)
+    )
+    
+    async def load() -> CachedResponse:
+        query = select(Screening).order_by(Screening.show_datetime, Screening.id)
+        if after_cursor is not None:
+            query = query.where(after_cursor)
+        
+        range_start = start
+        if upcoming:
+            now = datetime.utcnow()
+            range_start = max(start, now) if start else now
+        if range_start:
+            query = query.where(Screening.show_datetime >= range_start)
+        if end:
+            query = query.where(Screening.show_datetime < end)
+        if movie_id is not None:
+            query = query.where(Screening.movie_id == movie_id)
+        if screening_ids is not None:
+            query = query.where(Screening.id.in_(screening_ids))
+        if genre:
+            query = query.join(Movie, Movie.id == Screening.movie_id).where(Movie.genre == genre)
+        
+        # Fetch one extra row to know whether another page follows
+        result = await db.scalars(query.limit(limit + 1))
+        screenings = result.all()
+        headers = {}
+        if len(screenings) > limit:
+            screenings = screenings[:limit]
+            last = screenings[-1]
+            headers[NEXT_CURSOR_HEADER] = encode_cursor(last.show_datetime, last.id)
+        return CachedResponse.build(
+            [ScreeningResponse.model_validate(screening) for screening in screenings],
+            headers
+        )
+    
+    key = (
+        SCREENINGS, "list", cursor, limit, start, end, movie_id, genre, upcoming,
+        tuple(sorted(screening_ids)) if screening_ids is not None else None
+    )
+    cached = await catalog_cache.get_or_load(key, load)
+    return cached.to_response(if_none_match)
 
 
 @router.get("/{screening_id}", response_model=ScreeningResponse)
 async def get_screening_by_id(
     screening_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    if_none_match: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Get a specific screening by ID.
     Available to all authenticated users.
     """
-    screening = db.query(Screening).filter(Screening.id == screening_id).first()
-    if not screening:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Screening not found"
-        )
-    return screening
+    async def load() -> CachedResponse:
+        screening = await db.scalar(select(Screening).where(Screening.id == screening_id))
+        if not screening:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Screening not found"
+            )
+        return CachedResponse.build(ScreeningResponse.model_validate(screening))
+    
+    cached = await catalog_cache.get_or_load((SCREENINGS, screening_id), load)
+    return cached.to_response(if_none_match)
 
 
-def generate_seat_layout(total_seats: int) -> list[str]:
+async def build_seat_availability(
+    db: AsyncSession,
+    screening: Screening,
+    user_id: int
+) -> SeatAvailabilityResponse:
     """
-    Generate seat labels for a theater.
-    Format: Row letter (A-Z) + Seat number (1-10)
-    Example: A1, A2, ..., A10, B1, B2, ...
+    Build a screening's seat availability as seen by the given user.
+    `db` must be a primary session: a cold seat map is loaded from it and
+    then shared with booking, so a lagging replica must never feed it.
     """
-    seats = []
-    seats_per_row = 10
-    row_count = (total_seats + seats_per_row - 1) // seats_per_row
+    # Read occupancy from the cached bitset; only a cold map hits the DB
+    layout = layout_for_screening(screening.total_seats)
+    seat_map = await seat_maps.get(db, screening.id, layout)
+    # Seats held by other customers during checkout count as taken
+    held_seats = await seat_holds.held_by_others(screening.id, user_id)
     
-    for row_idx in range(min(row_count, 26)):  # Max 26 rows (A-Z)
-        row_letter = chr(65 + row_idx)  # A=65 in ASCII
-        for seat_num in range(1, seats_per_row + 1):
-            if len(seats) >= total_seats:
-                break
-            seats.append(f"{row_letter}{seat_num}")
+    taken_seats = []
+    available_seats = []
+    for index, seat in enumerate(layout.labels):
+        if seat_map.is_taken(index) or seat in held_seats:
+            taken_seats.append(seat)
+        else:
+            available_seats.append(seat)
     
-    return seats
+    return SeatAvailabilityResponse(
+        screening_id=screening.id,
+        total_seats=screening.total_seats,
+        available_count=len(available_seats),
+        taken_count=len(taken_seats),
+        taken_seats=taken_seats,
+        available_seats=available_seats
+    )
 
 
 @router.get("/{screening_id}/seats", response_model=SeatAvailabilityResponse)
 async def get_seat_availability(
     screening_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Get seat availability for a specific screening.
     Returns list of available and taken seats.
     """
-    screening = db.query(Screening).filter(Screening.id == screening_id).first()
+    screening = await db.scalar(select(Screening).where(Screening.id == screening_id))
     if not screening:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Screening not found"
         )
     
-    # Get all active reservations for this screening
-    active_reservations = db.query(Reservation).filter(
-        Reservation.screening_id == screening_id,
-        Reservation.status == "active"
-    ).all()
+    return await build_seat_availability(db, screening, current_user.id)
+
+
+@router.get("/{screening_id}/seats/best", response_model=BestSeatsResponse)
+async def get_best_seats(
+    screening_id: int,
+    count: int = Query(1, ge=1, le=settings.GROUP_BOOKING_MAX_SEATS),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Suggest the best available adjacent seats for a screening.
+    Seats are ranked by row preference and distance from the centre of the row.
+    """
+    screening = await db.scalar(select(Screening).where(Screening.id == screening_id))
+    if not screening:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Screening not found"
+        )
     
-    taken_seats = [r.seat_number for r in active_reservations]
+    layout = layout_for_screening(screening.total_seats)
+    seat_numbers = await allocate_best_seats(db, screening.id, layout, count, current_user.id)
+    if seat_numbers is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"No {count} adjacent seats are available for this screening"
+        )
+    return BestSeatsResponse(screening_id=screening_id, seat_numbers=seat_numbers)
+
+
+@router.get("/{screening_id}/stream")
+async def stream_seat_availability(
+    screening_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Stream live seat availability as server-sent events.
+    Sends a 'snapshot' event, then 'seats' deltas as seats are booked,
+    cancelled, held or released. A 'resync' event asks the client to reconnect.
+    """
+    screening = await db.scalar(select(Screening).where(Screening.id == screening_id))
+    if not screening:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Screening not found"
+        )
     
-    # Generate all possible seats based on total_seats
-    all_seats = generate_seat_layout(screening.total_seats)
+    # Subscribe before taking the snapshot so no delta is missed in between
+    queue = seat_events.subscribe(screening_id)
+    try:
+        snapshot = await build_seat_availability(db, screening, current_user.id)
+    except Exception:
+        seat_events.unsubscribe(screening_id, queue)
+        raise
     
-    # Calculate available seats
-    available_seats = [seat for seat in all_seats if seat not in taken_seats]
+    # The stream never touches the DB again, so return the connection now
+    await db.close()
     
-    return SeatAvailabilityResponse(
-        screening_id=screening_id,
-        total_seats=screening.total_seats,
-        available_count=len(available_seats),
-        taken_count=len(taken_seats),
-        taken_seats=taken_seats,
-        available_seats=available_seats
+    async def event_stream():
+        try:
+            yield format_sse("snapshot", snapshot.model_dump())
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        queue.get(), timeout=settings.SEAT_STREAM_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield b": ping\n\n"
+                    continue
+                
+                if message is None:
+                    yield format_sse("resync", {"screening_id": screening_id})
+                    break
+                yield message
+        finally:
+            seat_events.unsubscribe(screening_id, queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 
+def _is_slot_conflict(error: IntegrityError) -> bool:
+    """Whether an insert failed on unique_screening_slot (PostgreSQL names it, SQLite lists its columns)."""
+    message = str(error.orig)
+    return "unique_screening_slot" in message or "screenings.hall, screenings.show_datetime" in message
+
+
 @router.post("/", response_model=ScreeningResponse, status_code=status.HTTP_201_CREATED)
 async def create_screening(
     screening: ScreeningAdd,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     """
     Create a new screening.
     Admin only.
     """
+    if screening.hall > settings.SCREENING_HALLS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown hall {screening.hall}. Use a hall from 1 to {settings.SCREENING_HALLS}"
+        )
+    
     # Verify the movie exists
-    movie = db.query(Movie).filter(Movie.id == screening.movie_id).first()
+    movie = await db.scalar(select(Movie).where(Movie.id == screening.movie_id))
     if not movie:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -125,28 +308,40 @@ async def create_screening(
     # Create DB model from schema
     db_screening = Screening(**screening.dict())
     db.add(db_screening)
-    db.commit()
-    db.refresh(db_screening)
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if not _is_slot_conflict(e):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Hall {screening.hall} already has a screening at that time"
+        )
+    await db.refresh(db_screening)
+    catalog_cache.invalidate(SCREENINGS, MOVIES)
     return db_screening
 
 
 @router.delete("/{screening_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_screening(
     screening_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     """
     Delete a screening.
     Admin only.
     """
-    screening = db.query(Screening).filter(Screening.id == screening_id).first()
+    screening = await db.scalar(select(Screening).where(Screening.id == screening_id))
     if not screening:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Screening not found"
         )
     
-    db.delete(screening)
-    db.commit()
+    await db.delete(screening)
+    await db.commit()
+    seat_maps.invalidate(screening_id)
+    catalog_cache.invalidate(SCREENINGS, MOVIES)
     return None
\ No newline at end of file
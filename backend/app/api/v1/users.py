@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import get_password_hash, get_current_user, get_current_admin_user
-from app.database.database import get_db
+from app.core.security import get_password_hash_async, get_current_user, get_current_admin_user, Principal, token_cache
+from app.database.database import get_async_db
 from app.models.user import User
 from typing import List
 from app.schemas.user import UserCreate, UserResponse, UserLogin, UserUpdate
-from app.core.security import verify_password, create_access_token
+from app.core.security import verify_password_async, password_needs_rehash, create_access_token
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 
 
@@ -16,12 +17,12 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="users/login")
 
 
 @router.post("/register", response_model=UserResponse)
-async def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new user."""
     # Check if user already exists
-    db_user = db.query(User).filter(
+    db_user = await db.scalar(select(User).where(
         User.email == user.email
-    ).first()
+    ))
     
     if db_user:
         raise HTTPException(
@@ -29,32 +30,43 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
             detail="User already exists"
         )
     
+    # Return the connection while hashing; the insert below reconnects
+    await db.close()
+    
     # Create new user
-    password_hash = get_password_hash(user.password)
+    password_hash = await get_password_hash_async(user.password)
     db_user = User(
         email=user.email,
         password_hash=password_hash,
         role=user.role
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     return db_user
 
 
 
 @router.post("/login")
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
     """Login user and return access token."""
         
-    user = db.query(User).filter(User.email == form_data.username).first()
+    user = await db.scalar(select(User).where(User.email == form_data.username))
+    # Return the connection before the (slow) password check
+    await db.close()
         
-    if not user or not verify_password(form_data.password, user.password_hash):
+    if not user or not await verify_password_async(form_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
         )
+    
+    # Upgrade the stored hash transparently when the work factor has changed
+    if password_needs_rehash(user.password_hash):
+        user.password_hash = await get_password_hash_async(form_data.password)
+        db.add(user)
+        await db.commit()
         
     access_token = create_access_token(data={"sub": str(user.id)})
     return {"access_token": access_token, "token_type": "bearer"}
@@ -62,42 +74,36 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def get_current_user_info(current_user: Principal = Depends(get_current_user)):
     """Get current user information."""
-    user = db.query(User).filter(User.id == current_user.id).first()
-    
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-    
-    return user
+    # get_current_user already loaded (or cached) the user, so no second query
+    return current_user
 
 
 @router.get("/", response_model=List[UserResponse])
 async def read_users(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_admin_user)
 ):
     """
     Retrieve users.
     Only admin should be able to list all users, but for now we allow authenticated users.
     """
-    users = db.query(User).offset(skip).limit(limit).all()
+    result = await db.scalars(select(User).offset(skip).limit(limit))
+    users = result.all()
     return users
 
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def read_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Get a specific user by ID."""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -110,8 +116,8 @@ async def read_user(
 async def update_user(
     user_id: int,
     user_update: UserUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Update a user."""
     # Check permissions - only allow user to update themselves or admin
@@ -124,31 +130,33 @@ async def update_user(
              detail="Not authorized to update this user"
          )
 
-    db_user = db.query(User).filter(User.id == user_id).first()
+    # Hash before touching the database so no connection is held meanwhile
+    update_data = user_update.dict(exclude_unset=True)
+    if "password" in update_data:
+        update_data["password_hash"] = await get_password_hash_async(update_data.pop("password"))
+
+    db_user = await db.scalar(select(User).where(User.id == user_id))
     if not db_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-
-    update_data = user_update.dict(exclude_unset=True)
-    if "password" in update_data:
-        update_data["password_hash"] = get_password_hash(update_data.pop("password"))
         
     for key, value in update_data.items():
         setattr(db_user, key, value)
 
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    token_cache.invalidate_user(user_id)
     return db_user
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Delete a user."""
     # Check permissions - only admin or self
@@ -158,15 +166,16 @@ async def delete_user(
              detail="Not authorized to delete this user"
          )
          
-    db_user = db.query(User).filter(User.id == user_id).first()
+    db_user = await db.scalar(select(User).where(User.id == user_id))
     if not db_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
         
-    db.delete(db_user)
-    db.commit()
+    await db.delete(db_user)
+    await db.commit()
+    token_cache.invalidate_user(user_id)
     return None
 
 
@@ -0,0 +1,46 @@
+"""
+Database setup commands, run once per deployment (e.g. as a release step)
+instead of on every worker start.
+
+    python -m app.cli init-db           # create missing tables
+    python -m app.cli init-db --seed    # ...and seed demo movies and screenings
+    python -m app.cli seed              # seed demo movies and screenings
+"""
+import argparse
+import logging
+import sys
+from typing import Optional
+
+from app.core.scheduling import schedule_screenings
+from app.core.seed import seed_movies
+from app.database.database import SessionLocal, init_db
+
+logger = logging.getLogger(__name__)
+
+
+def seed() -> None:
+    """Seed demo movies if the catalog is empty and fill the screening schedule."""
+    with SessionLocal() as db:
+        seed_movies(db)
+        schedule_screenings(db)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Database setup commands.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    init_parser = commands.add_parser("init-db", help="Create missing tables")
+    init_parser.add_argument("--seed", action="store_true", help="Also seed demo movies and screenings")
+    commands.add_parser("seed", help="Seed demo movies and screenings")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "init-db":
+        init_db()
+        logger.info("Created any missing tables; existing tables are not altered (see 'Migrating an existing database' in the README)")
+    if args.command == "seed" or getattr(args, "seed", False):
+        seed()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
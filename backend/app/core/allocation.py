@@ -0,0 +1,164 @@
+"""
+Best-available seat allocation.
+
+Finds the best run of N adjacent free seats in a screening's seat map.
+Each layout is split once into blocks of physically adjacent seats (rows
+broken at aisles and gaps), and every candidate run is scored by how far
+it sits from the preferred row and from the centre of its row. Rows are
+visited from the best row outwards and the search stops as soon as no
+remaining row can beat the best run found, so a typical lookup only scans
+a handful of rows.
+"""
+import asyncio
+from functools import lru_cache
+from typing import Collection, Optional
+from weakref import WeakValueDictionary
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.holds import seat_holds
+from app.core.layout import SeatLayout
+from app.core.seatmap import SeatMap, seat_maps
+
+# Preferred row as a fraction of the hall depth, from the front (0.0) to the back (1.0)
+PREFERRED_ROW_FRACTION = 0.6
+# How much a row away from the preferred one costs relative to a seat off centre
+ROW_WEIGHT = 2.0
+
+# Per-screening locks, dropped once no booking holds a reference
+_allocation_locks: "WeakValueDictionary[int, asyncio.Lock]" = WeakValueDictionary()
+
+
+class SeatBlock:
+    """Physically adjacent seats within one row."""
+
+    __slots__ = ("row_idx", "indices", "seat_nums")
+
+    def __init__(self, row_idx: int, indices: tuple[int, ...], seat_nums: tuple[int, ...]):
+        self.row_idx = row_idx
+        self.indices = indices
+        self.seat_nums = seat_nums
+
+
+class AllocationPlan:
+    """Precomputed blocks and scoring constants for one layout."""
+
+    __slots__ = ("rows", "row_centre")
+
+    def __init__(self, layout: SeatLayout):
+        aisles = set(layout.aisles)
+        blocks: dict[int, list[SeatBlock]] = {}
+        current: list[tuple[int, int]] = []
+        current_row = None
+
+        def close_block():
+            if current:
+                blocks.setdefault(current_row, []).append(SeatBlock(
+                    current_row,
+                    tuple(index for index, _ in current),
+                    tuple(seat_num for _, seat_num in current),
+                ))
+                current.clear()
+
+        for index, (row_idx, seat_num) in enumerate(layout.positions):
+            if current and (
+                row_idx != current_row
+                or seat_num != current[-1][1] + 1
+                or current[-1][1] in aisles
+            ):
+                close_block()
+            current_row = row_idx
+            current.append((index, seat_num))
+        close_block()
+
+        preferred = (layout.rows - 1) * PREFERRED_ROW_FRACTION
+        row_scale = max(layout.rows - 1, 1)
+        # (row penalty, row index, row blocks), best rows first; ties favour the front
+        self.rows: tuple[tuple[float, int, tuple[SeatBlock, ...]], ...] = tuple(sorted(
+            (
+                ROW_WEIGHT * abs(row_idx - preferred) / row_scale,
+                row_idx,
+                tuple(row_blocks),
+            )
+            for row_idx, row_blocks in blocks.items()
+        ))
+        # Runs are centred on the full row width so a partial last row stays aligned
+        self.row_centre = (layout.seats_per_row + 1) / 2
+
+
+@lru_cache(maxsize=256)
+def get_allocation_plan(layout: SeatLayout) -> AllocationPlan:
+    """Return the shared allocation plan for an interned layout."""
+    return AllocationPlan(layout)
+
+
+def find_best_seats(
+    seat_map: SeatMap,
+    count: int,
+    excluded: Collection[int] = (),
+) -> Optional[list[str]]:
+    """
+    Return the labels of the best run of `count` adjacent free seats, or None.
+    Seats in `excluded` (e.g. held by other customers) are treated as taken.
+    """
+    layout = seat_map.layout
+    plan = get_allocation_plan(layout)
+    centre = plan.row_centre
+    half_width = max(layout.seats_per_row / 2, 1)
+
+    best_score = None
+    best_run = None
+    for row_penalty, _, row_blocks in plan.rows:
+        if best_score is not None and row_penalty >= best_score:
+            break
+
+        for block in row_blocks:
+            indices = block.indices
+            if len(indices) < count:
+                continue
+
+            # Slide a window of `count` seats along the block, tracking blocked seats
+            blocked = [seat_map.is_taken(index) or index in excluded for index in indices]
+            blocked_in_window = sum(blocked[:count])
+            seat_nums = block.seat_nums
+            for start in range(len(indices) - count + 1):
+                if start:
+                    blocked_in_window += blocked[start + count - 1] - blocked[start - 1]
+                if blocked_in_window:
+                    continue
+                run_centre = (seat_nums[start] + seat_nums[start + count - 1]) / 2
+                score = row_penalty + abs(run_centre - centre) / half_width
+                if best_score is None or score < best_score:
+                    best_score = score
+                    best_run = indices[start:start + count]
+
+    if best_run is None:
+        return None
+    return [layout.label_of(index) for index in best_run]
+
+
+async def allocate_best_seats(
+    db: AsyncSession,
+    screening_id: int,
+    layout: SeatLayout,
+    count: int,
+    user_id: int,
+    excluded: Collection[int] = (),
+) -> Optional[list[str]]:
+    """
+    Best adjacent seats that are neither taken nor held by another user.
+    Seats in `excluded` (e.g. just lost to a concurrent booking) are skipped too.
+    """
+    seat_map = await seat_maps.get(db, screening_id, layout)
+    held_seats = await seat_holds.held_by_others(screening_id, user_id)
+    blocked = {layout.index_of(seat) for seat in held_seats}
+    blocked.update(excluded)
+    return find_best_seats(seat_map, count, blocked)
+
+
+def allocation_lock(screening_id: int) -> asyncio.Lock:
+    """Lock serializing re-allocation for a screening within this process."""
+    lock = _allocation_locks.get(screening_id)
+    if lock is None:
+        lock = _allocation_locks[screening_id] = asyncio.Lock()
+    return lock
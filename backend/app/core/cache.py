@@ -0,0 +1,127 @@
+"""
+In-process response cache for read-mostly catalog endpoints.
+
+Movie and screening listings change only when admins edit the catalog or
+the seeder adds screenings, yet they are read on every page load. Responses
+are cached as encoded JSON bytes with a strong ETag, bounded by an LRU and a
+per-entry TTL. Concurrent misses for the same key share one load, and
+mutations invalidate whole namespaces explicitly. The TTL bounds how stale
+embedded seat counts can get between invalidations.
+"""
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import Response, status
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+
+# Namespaces used as the first element of cache keys
+MOVIES = "movies"
+SCREENINGS = "screenings"
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """An encoded JSON body with its ETag and extra response headers."""
+
+    body: bytes
+    etag: str
+    headers: tuple[tuple[str, str], ...] = ()
+
+    @classmethod
+    def build(cls, content: Any, headers: Optional[dict[str, str]] = None) -> "CachedResponse":
+        body = json.dumps(jsonable_encoder(content), separators=(",", ":")).encode()
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        return cls(body=body, etag=etag, headers=tuple((headers or {}).items()))
+
+    def to_response(self, if_none_match: Optional[str]) -> Response:
+        """Return the body, or an empty 304 if the client already has it."""
+        headers = {"ETag": self.etag, **dict(self.headers)}
+        if if_none_match is not None and self.etag in (tag.strip() for tag in if_none_match.split(",")):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=self.body, media_type="application/json", headers=headers)
+
+
+class ResponseCache:
+    """Size-bounded LRU of CachedResponse with TTLs, coalescing and namespaces."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # key -> (expires_at, response); key[0] is the namespace
+        self._entries: "OrderedDict[tuple, tuple[float, CachedResponse]]" = OrderedDict()
+        self._pending: dict[tuple, asyncio.Future] = {}
+        # Bumped on invalidation so a load racing a mutation is not cached
+        self._generations: dict[str, int] = {}
+
+    def get(self, key: tuple) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    def put(self, key: tuple, response: CachedResponse, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (time.monotonic() + ttl, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_load(
+        self,
+        key: tuple,
+        loader: Callable[[], Awaitable[CachedResponse]],
+        ttl_seconds: Optional[float] = None,
+    ) -> CachedResponse:
+        """Return the cached response for key, running loader once on a miss."""
+        response = self.get(key)
+        if response is not None:
+            return response
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        generation = self._generations.get(key[0], 0)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            response = await loader()
+            if self._generations.get(key[0], 0) == generation:
+                self.put(key, response, ttl_seconds)
+            future.set_result(response)
+            return response
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting on it
+            future.exception()
+            raise
+        finally:
+            del self._pending[key]
+
+    def invalidate(self, *namespaces: str) -> None:
+        """Drop every entry in the given namespaces."""
+        for namespace in namespaces:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+        for key in [key for key in self._entries if key[0] in namespaces]:
+            del self._entries[key]
+
+
+catalog_cache = ResponseCache(
+    max_entries=settings.CATALOG_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.CATALOG_CACHE_TTL_SECONDS,
+)
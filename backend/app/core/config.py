@@ -1,3 +1,6 @@
+from decimal import Decimal
+from typing import Dict, List, Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -6,11 +9,102 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    # Optional override; derived from DATABASE_URL when unset
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # Connection pool
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    # Recycle connections before server-side idle timeouts or failovers drop them
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Create tables and seed demo data on start-up instead of via `python -m app.cli`
+    DB_AUTO_INIT: bool = False
+    
+    # Read replicas (JSON list of URLs); empty means all reads use the primary
+    READ_REPLICA_URLS: List[str] = []
+    REPLICA_FAILURE_COOLDOWN_SECONDS: float = 30.0
+    REPLICA_HEALTH_CHECK_INTERVAL_SECONDS: float = 10.0
+    # How long a client's reads stay on the primary after it writes
+    READ_YOUR_WRITES_SECONDS: float = 5.0
     
     # JWT
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    AUTH_CACHE_TTL_SECONDS: float = 60.0
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_SIZE: int = 64
+    
+    # Ticket rendering
+    TICKET_RENDER_WORKERS: int = 2
+    TICKET_RENDER_QUEUE_SIZE: int = 32
+    TICKET_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    TICKET_EXPORT_MAX_PDF_PAGES: int = 200
+    
+    # Seat maps
+    SEAT_MAP_TTL_SECONDS: float = 30.0
+    SEAT_MAP_MAX_SCREENINGS: int = 1024
+    
+    # Seat holds
+    SEAT_HOLD_TTL_SECONDS: float = 300.0
+    SEAT_HOLD_MAX_LIFETIME_SECONDS: float = 900.0
+    SEAT_HOLD_MAX_PER_USER: int = 10
+    SEAT_HOLD_SWEEP_INTERVAL_SECONDS: float = 15.0
+    
+    # Live seat streams
+    SEAT_STREAM_QUEUE_SIZE: int = 256
+    SEAT_STREAM_HEARTBEAT_SECONDS: float = 15.0
+    
+    # Group bookings
+    GROUP_BOOKING_MAX_SEATS: int = 10
+    # Automatic allocations re-picked after losing seats to a concurrent booking
+    GROUP_BOOKING_ALLOCATION_ATTEMPTS: int = 3
+    
+    # Seat counters
+    SEAT_COUNTER_RECONCILE_INTERVAL_SECONDS: float = 600.0
+    
+    # Catalog response cache
+    CATALOG_CACHE_TTL_SECONDS: float = 15.0
+    CATALOG_CACHE_MAX_ENTRIES: int = 1024
+    
+    # Batch lookups
+    BATCH_LOOKUP_MAX_IDS: int = 100
+    
+    # Screening scheduler: daily showtimes ("HH:MM" -> ticket price), rotated across movies
+    SCREENING_SHOWTIMES: Dict[str, Decimal] = {
+        "10:00": Decimal("10.00"),
+        "14:00": Decimal("12.50"),
+        "18:00": Decimal("15.00"),
+        "21:00": Decimal("12.50"),
+    }
+    SCREENING_HORIZON_DAYS: int = 7
+    # Halls numbered 1..SCREENING_HALLS; each runs at most one screening per start time
+    SCREENING_HALLS: int = 4
+    SCREENING_TOTAL_SEATS: int = 100
+    SCREENING_SCHEDULE_CRON: str = "0 3 * * *"
+    
+    # Background jobs (leased through the database, one worker per run)
+    JOB_POLL_INTERVAL_SECONDS: float = 5.0
+    JOB_LEASE_SECONDS: float = 60.0
+    JOB_RETRY_BASE_SECONDS: float = 30.0
+    JOB_MAX_RETRIES: int = 3
+    JOB_HISTORY_RETENTION_DAYS: int = 30
+    
+    # Monitoring
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = 2.0
+    # Bearer token for Prometheus scrapers on /metrics and /health/pool; admins can always read them
+    METRICS_TOKEN: Optional[str] = None
+    
+    # SQL profiling: every request, or per request via an X-SQL-Profile header
+    SQL_PROFILING_ENABLED: bool = False
+    SQL_PROFILING_ALLOW_HEADER: bool = False
+    # Statement shapes repeated this often in one request are reported as N+1s
+    SQL_PROFILING_REPEAT_THRESHOLD: int = 3
     
     # App
     DEBUG: bool = False
@@ -23,7 +117,3 @@ class Settings(BaseSettings):
 
 
 settings = Settings()
-
-
-print("from config")
-
@@ -0,0 +1,57 @@
+"""
+Denormalized per-screening seat counters.
+
+Screening.seats_taken is kept in step with active reservations inside the
+booking and cancellation transactions, so listings can show availability
+without touching the reservations table. Writes that bypass those paths
+(cascading deletes, manual fixes) can still make counters drift, so a
+background job periodically recounts every screening in one set-based
+UPDATE and repairs only the rows that differ.
+"""
+import logging
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.database import AsyncSessionLocal
+from app.models.user import Reservation, Screening
+
+logger = logging.getLogger(__name__)
+
+
+def adjust_seats_taken(screening_id: int, delta: int):
+    """UPDATE statement that moves a screening's counter by delta."""
+    return (
+        update(Screening)
+        .where(Screening.id == screening_id)
+        .values(seats_taken=Screening.seats_taken + delta)
+    )
+
+
+async def reconcile_seat_counters(db: AsyncSession) -> int:
+    """Recount active reservations for every screening and fix drifted counters."""
+    actual = (
+        select(func.count(Reservation.id))
+        .where(
+            Reservation.screening_id == Screening.id,
+            Reservation.status == "active"
+        )
+        .correlate(Screening)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        update(Screening)
+        .where(Screening.seats_taken != actual)
+        .values(seats_taken=actual)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def seat_counter_reconcile_job():
+    """Scheduled job that repairs drifted seat counters."""
+    async with AsyncSessionLocal() as db:
+        repaired = await reconcile_seat_counters(db)
+    if repaired:
+        logger.warning(f"Repaired seat counters for {repaired} screenings")
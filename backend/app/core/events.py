@@ -0,0 +1,70 @@
+"""
+In-process pub/sub for live seat availability.
+
+Booking, cancellation and hold changes publish small seat deltas per
+screening; each streaming client owns a bounded queue. Messages are encoded
+once per publish and shared by every subscriber, so fan-out costs one
+queue put per client and no database work.
+"""
+import asyncio
+import json
+from typing import Iterable
+
+from app.core.config import settings
+
+
+def format_sse(event: str, data: dict) -> bytes:
+    """Encode a server-sent event frame."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
+
+
+class SeatEventBroker:
+    """Fan seat deltas out to every subscriber of a screening."""
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: dict[int, set[asyncio.Queue]] = {}
+
+    def subscribe(self, screening_id: int) -> asyncio.Queue:
+        """
+        Register a queue for a screening's events.
+        A None item means the subscriber fell behind and must resync.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(screening_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, screening_id: int, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(screening_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[screening_id]
+
+    def publish(
+        self,
+        screening_id: int,
+        taken: Iterable[str] = (),
+        available: Iterable[str] = (),
+    ) -> None:
+        """Send a seat delta to every subscriber of the screening."""
+        queues = self._subscribers.get(screening_id)
+        if not queues:
+            return
+
+        message = format_sse("seats", {
+            "screening_id": screening_id,
+            "taken": list(taken),
+            "available": list(available),
+        })
+        for queue in queues:
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Drop the backlog and tell the client to reconnect for a fresh snapshot
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+
+seat_events = SeatEventBroker(queue_size=settings.SEAT_STREAM_QUEUE_SIZE)
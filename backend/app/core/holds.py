@@ -0,0 +1,240 @@
+"""
+Temporary seat holds for checkout.
+
+A hold reserves a seat for one user for a short TTL while they enter
+payment details, so contention is detected when the seat is picked rather
+than after payment. Holds live in a pluggable backend (in-process by
+default) and are reclaimed in bulk by a background sweeper.
+"""
+import asyncio
+import heapq
+import logging
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, replace
+from typing import Optional
+
+from app.core.config import settings
+from app.core.events import seat_events
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SeatHold:
+    """A seat held by a user until expires_at (epoch seconds)."""
+
+    hold_id: str
+    screening_id: int
+    seat_number: str
+    user_id: int
+    created_at: float
+    expires_at: float
+
+
+class HoldBackend(ABC):
+    """Storage interface for seat holds."""
+
+    @abstractmethod
+    async def get(self, hold_id: str) -> Optional[SeatHold]:
+        """Return a hold by id, expired or not."""
+
+    @abstractmethod
+    async def get_for_seat(self, screening_id: int, seat_number: str) -> Optional[SeatHold]:
+        """Return the hold on a seat, expired or not."""
+
+    @abstractmethod
+    async def held_seats(self, screening_id: int) -> list[SeatHold]:
+        """Return all holds for a screening, expired or not."""
+
+    @abstractmethod
+    async def count_for_user(self, user_id: int) -> int:
+        """Return the number of holds owned by a user."""
+
+    @abstractmethod
+    async def put(self, hold: SeatHold) -> None:
+        """Insert or replace a hold."""
+
+    @abstractmethod
+    async def remove(self, hold_id: str) -> None:
+        """Delete a hold if it exists."""
+
+    @abstractmethod
+    async def remove_expired(self, now: float) -> list[SeatHold]:
+        """Delete every hold that expired before now and return them."""
+
+
+class InMemoryHoldBackend(HoldBackend):
+    """Process-local hold storage with an expiry heap for bulk sweeps."""
+
+    def __init__(self):
+        self._holds: dict[str, SeatHold] = {}
+        self._by_seat: dict[tuple[int, str], str] = {}
+        self._by_screening: dict[int, set[str]] = {}
+        self._by_user: dict[int, set[str]] = {}
+        # (expires_at, hold_id); stale entries are skipped when popped
+        self._expiry_heap: list[tuple[float, str]] = []
+
+    async def get(self, hold_id: str) -> Optional[SeatHold]:
+        return self._holds.get(hold_id)
+
+    async def get_for_seat(self, screening_id: int, seat_number: str) -> Optional[SeatHold]:
+        hold_id = self._by_seat.get((screening_id, seat_number))
+        return self._holds.get(hold_id) if hold_id else None
+
+    async def held_seats(self, screening_id: int) -> list[SeatHold]:
+        return [self._holds[hold_id] for hold_id in self._by_screening.get(screening_id, ())]
+
+    async def count_for_user(self, user_id: int) -> int:
+        return len(self._by_user.get(user_id, ()))
+
+    async def put(self, hold: SeatHold) -> None:
+        previous = self._holds.get(hold.hold_id)
+        if previous is None:
+            self._by_seat[(hold.screening_id, hold.seat_number)] = hold.hold_id
+            self._by_screening.setdefault(hold.screening_id, set()).add(hold.hold_id)
+            self._by_user.setdefault(hold.user_id, set()).add(hold.hold_id)
+        self._holds[hold.hold_id] = hold
+        heapq.heappush(self._expiry_heap, (hold.expires_at, hold.hold_id))
+
+    async def remove(self, hold_id: str) -> None:
+        self._discard(hold_id)
+
+    async def remove_expired(self, now: float) -> list[SeatHold]:
+        expired = []
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, hold_id = heapq.heappop(self._expiry_heap)
+            hold = self._holds.get(hold_id)
+            # Skip entries superseded by an extension or an explicit release
+            if hold is not None and hold.expires_at == expires_at:
+                self._discard(hold_id)
+                expired.append(hold)
+        return expired
+
+    def _discard(self, hold_id: str) -> None:
+        hold = self._holds.pop(hold_id, None)
+        if hold is None:
+            return
+        self._by_seat.pop((hold.screening_id, hold.seat_number), None)
+        for index, key in ((self._by_screening, hold.screening_id), (self._by_user, hold.user_id)):
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(hold_id)
+                if not ids:
+                    del index[key]
+
+
+class SeatHoldStore:
+    """Hold, extend and release seats, treating expired holds as absent."""
+
+    def __init__(self, backend: HoldBackend, ttl_seconds: float, max_lifetime_seconds: float, max_per_user: int):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.max_lifetime_seconds = max_lifetime_seconds
+        self.max_per_user = max_per_user
+
+    async def _active_for_seat(self, screening_id: int, seat_number: str) -> Optional[SeatHold]:
+        hold = await self.backend.get_for_seat(screening_id, seat_number)
+        if hold is None or hold.expires_at <= time.time():
+            return None
+        return hold
+
+    async def get(self, hold_id: str) -> Optional[SeatHold]:
+        hold = await self.backend.get(hold_id)
+        if hold is None or hold.expires_at <= time.time():
+            return None
+        return hold
+
+    async def holder_of(self, screening_id: int, seat_number: str) -> Optional[int]:
+        """Return the id of the user actively holding a seat, if any."""
+        hold = await self._active_for_seat(screening_id, seat_number)
+        return hold.user_id if hold else None
+
+    async def held_by_others(self, screening_id: int, user_id: int) -> set[str]:
+        """Seat labels actively held by users other than user_id."""
+        now = time.time()
+        return {
+            hold.seat_number
+            for hold in await self.backend.held_seats(screening_id)
+            if hold.expires_at > now and hold.user_id != user_id
+        }
+
+    async def hold(self, screening_id: int, seat_number: str, user_id: int) -> Optional[SeatHold]:
+        """
+        Hold a seat for user_id.
+        Returns None if another user holds it; re-holding your own seat extends it.
+        """
+        existing = await self.backend.get_for_seat(screening_id, seat_number)
+        now = time.time()
+        if existing is not None and existing.expires_at > now:
+            if existing.user_id != user_id:
+                return None
+            return await self.extend(existing)
+        if existing is not None:
+            # Drop an expired hold the sweeper has not reclaimed yet
+            await self.backend.remove(existing.hold_id)
+
+        hold = SeatHold(
+            hold_id=uuid.uuid4().hex,
+            screening_id=screening_id,
+            seat_number=seat_number,
+            user_id=user_id,
+            created_at=now,
+            expires_at=now + self.ttl_seconds,
+        )
+        await self.backend.put(hold)
+        return hold
+
+    async def extend(self, hold: SeatHold) -> SeatHold:
+        """Push expiry out by one TTL, capped at the maximum hold lifetime."""
+        expires_at = min(time.time() + self.ttl_seconds, hold.created_at + self.max_lifetime_seconds)
+        extended = replace(hold, expires_at=max(expires_at, hold.expires_at))
+        await self.backend.put(extended)
+        return extended
+
+    async def release(self, hold: SeatHold) -> None:
+        await self.backend.remove(hold.hold_id)
+
+    async def release_seat(self, screening_id: int, seat_number: str, user_id: int) -> None:
+        """Release user_id's hold on a seat, e.g. once it has been booked."""
+        hold = await self.backend.get_for_seat(screening_id, seat_number)
+        if hold is not None and hold.user_id == user_id:
+            await self.backend.remove(hold.hold_id)
+
+    async def count_for_user(self, user_id: int) -> int:
+        return await self.backend.count_for_user(user_id)
+
+    async def sweep(self) -> list[SeatHold]:
+        """Reclaim all expired holds in one pass."""
+        return await self.backend.remove_expired(time.time())
+
+
+seat_holds = SeatHoldStore(
+    InMemoryHoldBackend(),
+    ttl_seconds=settings.SEAT_HOLD_TTL_SECONDS,
+    max_lifetime_seconds=settings.SEAT_HOLD_MAX_LIFETIME_SECONDS,
+    max_per_user=settings.SEAT_HOLD_MAX_PER_USER,
+)
+
+
+async def hold_sweeper_task():
+    """Background task that reclaims expired seat holds."""
+    while True:
+        try:
+            await asyncio.sleep(settings.SEAT_HOLD_SWEEP_INTERVAL_SECONDS)
+
+            expired = await seat_holds.sweep()
+            if expired:
+                released: dict[int, list[str]] = {}
+                for hold in expired:
+                    released.setdefault(hold.screening_id, []).append(hold.seat_number)
+                for screening_id, seats in released.items():
+                    seat_events.publish(screening_id, available=seats)
+                logger.info(f"Reclaimed {len(expired)} expired seat holds")
+
+        except asyncio.CancelledError:
+            logger.info("Seat hold sweeper cancelled")
+            break
+        except Exception as e:
+            logger.error(f"Error in seat hold sweeper: {e}")
@@ -0,0 +1,433 @@
+"""
+Background job scheduler with a database-backed leader lease.
+
+Jobs are async callables with an interval or cron trigger. Their schedule
+lives in the scheduled_jobs table rather than in each process, so any
+number of workers can run the scheduler: a worker claims a due job with a
+conditional UPDATE that only succeeds while nobody else holds an unexpired
+lease, renews the lease while the job runs, and then writes the next run
+time and releases it. A renewal that fails is retried with backoff; if the
+lease cannot be kept, the job is cancelled rather than left running
+alongside whichever worker claims it next. A failed run is retried after an
+exponential, jittered delay (so retries from different workers do not line
+up) until JOB_MAX_RETRIES is reached, after which the job waits for its next
+regular time. Every execution is recorded in job_runs.
+
+Jobs run as their own tasks, so the polling loop and request handling never
+wait on them; blocking work inside a job belongs in asyncio.to_thread.
+"""
+import asyncio
+import logging
+import os
+import random
+import socket
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional, Union
+
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.database.database import AsyncSessionLocal
+from app.models.user import JobRun, ScheduledJob
+
+logger = logging.getLogger(__name__)
+
+# Longest retry delay, however many failures have accumulated
+MAX_RETRY_DELAY_SECONDS = 3600
+# Longest stored error message
+MAX_ERROR_LENGTH = 2000
+# First retry delay after a failed lease renewal, doubled on each further failure
+LEASE_RETRY_BASE_SECONDS = 1.0
+
+CRON_ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+    "@yearly": "0 0 1 1 *",
+}
+# (minimum, maximum) per cron field: minute, hour, day of month, month, day of week
+CRON_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+
+class IntervalTrigger:
+    """Run every `seconds` seconds."""
+
+    def __init__(self, seconds: float):
+        if seconds <= 0:
+            raise ValueError("Interval must be positive")
+        self.seconds = seconds
+
+    def next_after(self, moment: datetime) -> datetime:
+        return moment + timedelta(seconds=self.seconds)
+
+    def __repr__(self) -> str:
+        return f"IntervalTrigger({self.seconds}s)"
+
+
+class CronTrigger:
+    """
+    Run at times matching a five-field cron expression (UTC), e.g. "0 3 * * *".
+    Supports *, lists, ranges, steps and the @hourly/@daily/... aliases.
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        fields = CRON_ALIASES.get(expression.strip(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression must have 5 fields: {expression!r}")
+        parsed = [self._parse_field(field, *bounds) for field, bounds in zip(fields, CRON_RANGES)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        # Both 0 and 7 mean Sunday
+        self.weekdays = {day % 7 for day in weekdays}
+        self.day_restricted = fields[2] != "*"
+        self.weekday_restricted = fields[4] != "*"
+
+    @staticmethod
+    def _parse_field(field: str, minimum: int, maximum: int) -> set[int]:
+        values: set[int] = set()
+        for part in field.split(","):
+            span, _, step = part.partition("/")
+            if span == "*":
+                start, end = minimum, maximum
+            elif "-" in span:
+                start, end = (int(value) for value in span.split("-", 1))
+            else:
+                start = end = int(span)
+                if step:
+                    end = maximum
+            step_size = int(step) if step else 1
+            if not minimum <= start <= end <= maximum or step_size < 1:
+                raise ValueError(f"Invalid cron field {field!r}")
+            values.update(range(start, end + 1, step_size))
+        return values
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        # datetime.weekday() is Monday=0; cron is Sunday=0
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        # Standard cron: when both are restricted, either may match
+        if self.day_restricted and self.weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, moment: datetime) -> datetime:
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # Skip whole months, days and hours that cannot match
+        for _ in range(100_000):
+            if candidate.month not in self.months:
+                year, month = divmod(candidate.month, 12)
+                candidate = candidate.replace(year=candidate.year + year, month=month + 1, day=1, hour=0, minute=0)
+            elif not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+
+    def __repr__(self) -> str:
+        return f"CronTrigger({self.expression!r})"
+
+
+Trigger = Union[IntervalTrigger, CronTrigger]
+
+
+class LeaseLost(Exception):
+    """Raised when running work is cancelled because its lease could not be kept."""
+
+    def __init__(self, name: str):
+        super().__init__(f"Lost the lease on job {name}")
+        self.name = name
+
+
+@dataclass(frozen=True)
+class Job:
+    """A named async callable and when to run it."""
+
+    name: str
+    func: Callable[[], Awaitable[None]]
+    trigger: Trigger
+    # Run as soon as the job is first registered instead of at its first trigger time
+    run_immediately: bool = False
+
+
+def retry_delay(failures: int) -> float:
+    """Exponential backoff with equal jitter for the given failure count."""
+    delay = min(settings.JOB_RETRY_BASE_SECONDS * 2 ** (failures - 1), MAX_RETRY_DELAY_SECONDS)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class JobScheduler:
+    """Polls for due jobs and runs each on at most one worker at a time."""
+
+    def __init__(self, sessionmaker: Callable[[], AsyncSession] = AsyncSessionLocal):
+        self.sessionmaker = sessionmaker
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.jobs: dict[str, Job] = {}
+        self._running: dict[str, asyncio.Task] = {}
+
+    def add_job(self, job: Job) -> None:
+        """Register a job (replacing any job with the same name)."""
+        self.jobs[job.name] = job
+
+    async def _register(self) -> None:
+        """Create schedule rows for jobs that have never been seen."""
+        now = datetime.utcnow()
+        async with self.sessionmaker() as db:
+            known = set(await db.scalars(select(ScheduledJob.name)))
+            for job in self.jobs.values():
+                if job.name in known:
+                    continue
+                db.add(ScheduledJob(
+                    name=job.name,
+                    next_run_at=now if job.run_immediately else job.trigger.next_after(now),
+                ))
+                try:
+                    await db.commit()
+                except IntegrityError:
+                    # Another worker registered it first
+                    await db.rollback()
+
+    async def _claim(self, job: Job) -> Optional[int]:
+        """Take the lease on a due job. Returns its failure count, or None if not claimed."""
+        now = datetime.utcnow()
+        async with self.sessionmaker() as db:
+            result = await db.execute(
+                update(ScheduledJob)
+                .where(
+                    ScheduledJob.name == job.name,
+                    ScheduledJob.next_run_at <= now,
+                    or_(ScheduledJob.lease_expires_at.is_(None), ScheduledJob.lease_expires_at < now),
+                )
+                .values(
+                    lease_owner=self.owner,
+                    lease_expires_at=now + timedelta(seconds=settings.JOB_LEASE_SECONDS),
+                )
+            )
+            if result.rowcount != 1:
+                await db.rollback()
+                return None
+            failures = await db.scalar(
+                select(ScheduledJob.consecutive_failures).where(ScheduledJob.name == job.name)
+            )
+            await db.commit()
+            return failures
+
+    async def _renew_lease(self, name: str, work: asyncio.Future) -> None:
+        """
+        Extend the lease while `work` runs. Failed renewals are retried with
+        backoff; `work` is cancelled once the lease belongs to another worker
+        or would expire before the next attempt.
+        """
+        interval = settings.JOB_LEASE_SECONDS / 3
+        # Conservative local view of the expiry: counted from before each renewal
+        expires_at = time.monotonic() + settings.JOB_LEASE_SECONDS
+        delay, failures = interval, 0
+        while True:
+            await asyncio.sleep(delay)
+            attempted_at = time.monotonic()
+            try:
+                async with self.sessionmaker() as db:
+                    result = await db.execute(
+                        update(ScheduledJob)
+                        .where(ScheduledJob.name == name, ScheduledJob.lease_owner == self.owner)
+                        .values(lease_expires_at=datetime.utcnow() + timedelta(seconds=settings.JOB_LEASE_SECONDS))
+                    )
+                    await db.commit()
+            except Exception as e:
+                failures += 1
+                delay = min(LEASE_RETRY_BASE_SECONDS * 2 ** (failures - 1), interval)
+                if time.monotonic() + delay >= expires_at:
+                    logger.error(f"Could not renew the lease on job {name} before it expires, cancelling it: {e}")
+                    work.cancel()
+                    return
+                logger.warning(f"Failed to renew the lease on job {name}, retrying in {delay:.0f}s: {e}")
+                continue
+
+            if result.rowcount != 1:
+                logger.error(f"Lost the lease on job {name} while it was running, cancelling it")
+                work.cancel()
+                return
+            expires_at = attempted_at + settings.JOB_LEASE_SECONDS
+            delay, failures = interval, 0
+
+    async def _run_leased(self, name: str, func: Callable[[], Awaitable[None]]) -> None:
+        """Run func while renewing the lease on `name`. Raises LeaseLost if the lease could not be kept."""
+        work = asyncio.ensure_future(func())
+        renewal = asyncio.create_task(self._renew_lease(name, work))
+        try:
+            await work
+        except asyncio.CancelledError:
+            # A finished renewal task means it gave up on the lease and cancelled the work
+            if renewal.done() and not renewal.cancelled():
+                raise LeaseLost(name) from None
+            raise
+        finally:
+            renewal.cancel()
+
+    async def _execute(self, job: Job, failures: int) -> None:
+        async with self.sessionmaker() as db:
+            run = JobRun(job_name=job.name, owner=self.owner, attempt=failures + 1, status="running")
+            db.add(run)
+            await db.commit()
+            run_id = run.id
+
+        status, error = "succeeded", None
+        try:
+            await self._run_leased(job.name, job.func)
+        except asyncio.CancelledError:
+            status, error = "cancelled", "Worker shut down"
+            raise
+        except LeaseLost as e:
+            status, error = "cancelled", str(e)
+        except Exception as e:
+            logger.exception(f"Job {job.name} failed")
+            status, error = "failed", f"{type(e).__name__}: {e}"[:MAX_ERROR_LENGTH]
+        finally:
+            await self._finish(job, run_id, failures, status, error)
+
+    async def _finish(self, job: Job, run_id: int, failures: int, status: str, error: Optional[str]) -> None:
+        """Record the outcome, schedule the next run and release the lease."""
+        now = datetime.utcnow()
+        if status == "succeeded":
+            failures, next_run_at = 0, job.trigger.next_after(now)
+        elif status == "cancelled":
+            # Not the job's fault; let another worker pick it up straight away
+            next_run_at = now
+        elif failures + 1 <= settings.JOB_MAX_RETRIES:
+            failures += 1
+            next_run_at = now + timedelta(seconds=retry_delay(failures))
+            logger.warning(f"Retrying job {job.name} at {next_run_at:%H:%M:%S} (attempt {failures + 1})")
+        else:
+            logger.error(f"Job {job.name} failed {failures + 1} times, waiting for its next scheduled run")
+            failures, next_run_at = 0, job.trigger.next_after(now)
+
+        async with self.sessionmaker() as db:
+            await db.execute(
+                update(JobRun)
+                .where(JobRun.id == run_id)
+                .values(status=status, finished_at=now, error=error)
+            )
+            await db.execute(
+                update(ScheduledJob)
+                .where(ScheduledJob.name == job.name, ScheduledJob.lease_owner == self.owner)
+                .values(
+                    next_run_at=next_run_at,
+                    consecutive_failures=failures,
+                    lease_owner=None,
+                    lease_expires_at=None,
+                )
+            )
+            await db.commit()
+
+    async def run_exclusive(self, name: str, func: Callable[[], Awaitable[None]]) -> bool:
+        """
+        Run one-off work (e.g. start-up seeding) now under the lease named
+        `name`, unless another worker holds it. Returns whether this worker ran
+        it; raises LeaseLost if the lease could not be kept while it ran.
+        """
+        now = datetime.utcnow()
+        async with self.sessionmaker() as db:
+            if await db.scalar(select(ScheduledJob.name).where(ScheduledJob.name == name)) is None:
+                db.add(ScheduledJob(name=name, next_run_at=now))
+                try:
+                    await db.commit()
+                except IntegrityError:
+                    # Another worker created it first
+                    await db.rollback()
+            result = await db.execute(
+                update(ScheduledJob)
+                .where(
+                    ScheduledJob.name == name,
+                    or_(ScheduledJob.lease_expires_at.is_(None), ScheduledJob.lease_expires_at < now),
+                )
+                .values(
+                    lease_owner=self.owner,
+                    lease_expires_at=now + timedelta(seconds=settings.JOB_LEASE_SECONDS),
+                )
+            )
+            await db.commit()
+        if result.rowcount != 1:
+            return False
+
+        try:
+            await self._run_leased(name, func)
+        finally:
+            async with self.sessionmaker() as db:
+                await db.execute(
+                    update(ScheduledJob)
+                    .where(ScheduledJob.name == name, ScheduledJob.lease_owner == self.owner)
+                    .values(next_run_at=datetime.utcnow(), lease_owner=None, lease_expires_at=None)
+                )
+                await db.commit()
+        return True
+
+    async def run_pending(self) -> None:
+        """Start every due job this worker can claim."""
+        now = datetime.utcnow()
+        async with self.sessionmaker() as db:
+            due = set(await db.scalars(
+                select(ScheduledJob.name).where(
+                    ScheduledJob.name.in_(list(self.jobs)),
+                    ScheduledJob.next_run_at <= now,
+                    or_(ScheduledJob.lease_expires_at.is_(None), ScheduledJob.lease_expires_at < now),
+                )
+            ))
+        for name in due:
+            if name in self._running:
+                continue
+            job = self.jobs[name]
+            failures = await self._claim(job)
+            if failures is None:
+                continue
+            task = asyncio.create_task(self._execute(job, failures))
+            self._running[name] = task
+            task.add_done_callback(lambda _, name=name: self._running.pop(name, None))
+
+    async def run(self) -> None:
+        """Background task polling for due jobs until cancelled."""
+        registered = False
+        try:
+            while True:
+                try:
+                    if not registered:
+                        await self._register()
+                        registered = True
+                    await self.run_pending()
+                except Exception as e:
+                    logger.error(f"Error in job scheduler: {e}")
+
+                # Jittered so workers polling the same table spread out
+                await asyncio.sleep(settings.JOB_POLL_INTERVAL_SECONDS * random.uniform(0.8, 1.2))
+        except asyncio.CancelledError:
+            await self.shutdown()
+            logger.info("Job scheduler cancelled")
+
+    async def shutdown(self) -> None:
+        """Cancel running jobs; their leases are released for other workers."""
+        tasks = list(self._running.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def prune_job_runs() -> None:
+    """Delete job history older than JOB_HISTORY_RETENTION_DAYS."""
+    cutoff = datetime.utcnow() - timedelta(days=settings.JOB_HISTORY_RETENTION_DAYS)
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(delete(JobRun).where(JobRun.started_at < cutoff))
+        await db.commit()
+    if result.rowcount:
+        logger.info(f"Pruned {result.rowcount} job runs older than {settings.JOB_HISTORY_RETENTION_DAYS} days")
+
+
+job_scheduler = JobScheduler()
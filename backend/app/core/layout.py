@@ -0,0 +1,106 @@
+"""
+Precomputed, interned seat layouts.
+
+A layout describes the physical seat plan of a hall: its rows, seats per
+row, aisles and gaps. Each distinct plan is computed once and shared by
+every screening that uses it, so seat labels can be mapped to integer
+indices (and back) with a dict or tuple lookup instead of rebuilding and
+scanning label lists on each request.
+"""
+from functools import lru_cache
+from typing import Iterable, Optional
+
+DEFAULT_SEATS_PER_ROW = 10
+
+
+def row_label(row_idx: int) -> str:
+    """Spreadsheet-style row label: A..Z, then AA, AB, ..."""
+    label = ""
+    row_idx += 1
+    while row_idx:
+        row_idx, remainder = divmod(row_idx - 1, 26)
+        label = chr(65 + remainder) + label
+    return label
+
+
+class SeatLayout:
+    """Immutable seat plan with O(1) label <-> index mapping."""
+
+    __slots__ = ("rows", "seats_per_row", "aisles", "gaps", "labels", "positions", "_index")
+
+    def __init__(
+        self,
+        rows: int,
+        seats_per_row: int,
+        aisles: tuple[int, ...] = (),
+        gaps: frozenset[tuple[int, int]] = frozenset(),
+        capacity: Optional[int] = None,
+    ):
+        self.rows = rows
+        self.seats_per_row = seats_per_row
+        # Seat numbers after which an aisle runs, e.g. (2, 8)
+        self.aisles = aisles
+        # (row index, seat number) pairs with no physical seat
+        self.gaps = gaps
+
+        labels = []
+        positions = []
+        for row_idx in range(rows):
+            row = row_label(row_idx)
+            for seat_num in range(1, seats_per_row + 1):
+                if capacity is not None and len(labels) >= capacity:
+                    break
+                if (row_idx, seat_num) in gaps:
+                    continue
+                labels.append(f"{row}{seat_num}")
+                positions.append((row_idx, seat_num))
+
+        self.labels: tuple[str, ...] = tuple(labels)
+        self.positions: tuple[tuple[int, int], ...] = tuple(positions)
+        self._index: dict[str, int] = {label: index for index, label in enumerate(labels)}
+
+    @property
+    def total_seats(self) -> int:
+        return len(self.labels)
+
+    def index_of(self, seat_number: str) -> Optional[int]:
+        """Return the seat's index, or None if the label is not in this layout."""
+        return self._index.get(seat_number)
+
+    def label_of(self, index: int) -> str:
+        return self.labels[index]
+
+    def __repr__(self) -> str:
+        return f"SeatLayout(rows={self.rows}, seats_per_row={self.seats_per_row}, seats={self.total_seats})"
+
+
+@lru_cache(maxsize=None)
+def _intern_layout(
+    rows: int,
+    seats_per_row: int,
+    aisles: tuple[int, ...],
+    gaps: frozenset[tuple[int, int]],
+    capacity: Optional[int],
+) -> SeatLayout:
+    return SeatLayout(rows, seats_per_row, aisles, gaps, capacity)
+
+
+def get_layout(
+    rows: int,
+    seats_per_row: int,
+    aisles: Iterable[int] = (),
+    gaps: Iterable[tuple[int, int]] = (),
+    capacity: Optional[int] = None,
+) -> SeatLayout:
+    """Return the shared layout instance for this seat plan."""
+    return _intern_layout(rows, seats_per_row, tuple(sorted(aisles)), frozenset(gaps), capacity)
+
+
+def layout_for_screening(total_seats: int) -> SeatLayout:
+    """
+    Layout used for a screening with the given capacity.
+    Rows of 10 seats (A1..A10, B1..B10, ...), last row partially filled.
+    """
+    rows = (total_seats + DEFAULT_SEATS_PER_ROW - 1) // DEFAULT_SEATS_PER_ROW
+    capacity = None if total_seats % DEFAULT_SEATS_PER_ROW == 0 else total_seats
+    return get_layout(rows, DEFAULT_SEATS_PER_ROW, capacity=capacity)
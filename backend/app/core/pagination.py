@@ -0,0 +1,60 @@
+"""
+Keyset (cursor) pagination and listing query helpers.
+
+Listings are ordered by a (timestamp, id) key and each page starts strictly
+after the last row of the previous one, so fetching any page costs the same
+index range scan instead of an OFFSET that grows with the page number. The
+cursor handed to clients is an opaque, URL-safe encoding of that key.
+"""
+import base64
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+# Response header carrying the cursor of the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """Encode a (timestamp, id) key as an opaque cursor."""
+    raw = f"{timestamp.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor. Raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        timestamp, row_id = raw.split("|")
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def after_key(timestamp_column, id_column, cursor: Optional[str]) -> Optional[ColumnElement]:
+    """
+    Filter for rows strictly after the cursor's (timestamp, id) key.
+    The leading >= keeps the condition usable as a range on the timestamp index.
+    """
+    if cursor is None:
+        return None
+    timestamp, row_id = decode_cursor(cursor)
+    return and_(
+        timestamp_column >= timestamp,
+        or_(timestamp_column > timestamp, id_column > row_id),
+    )
+
+
+def parse_id_list(value: Optional[str], max_ids: int) -> Optional[list[int]]:
+    """
+    Parse a comma-separated id list such as "3,5,8" for batch lookups.
+    Raises ValueError if an id is not an integer or there are too many.
+    """
+    if value is None:
+        return None
+    ids = list(dict.fromkeys(int(part) for part in value.split(",") if part.strip()))
+    if len(ids) > max_ids:
+        raise ValueError(f"At most {max_ids} ids can be requested at once")
+    return ids
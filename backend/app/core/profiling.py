@@ -0,0 +1,167 @@
+"""
+Opt-in per-request SQL profiling and N+1 detection.
+
+When profiling is on for a request, every statement executed through an
+instrumented engine is recorded with its duration. Statements are grouped by
+shape (whitespace collapsed, IN lists folded) so a query run once per row of
+a previous result shows up as one shape with a high count. The totals are
+returned in response headers and the statements are logged, with repeated
+shapes logged as warnings.
+
+Profiling runs for every request when SQL_PROFILING_ENABLED is set, or per
+request with an `X-SQL-Profile: 1` header when SQL_PROFILING_ALLOW_HEADER is
+set. `max_queries` gives the same recording to in-process callers so a
+query budget can be asserted per endpoint.
+"""
+import contextvars
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_REQUEST_HEADER = "x-sql-profile"
+QUERY_COUNT_HEADER = "X-SQL-Query-Count"
+QUERY_TIME_HEADER = "X-SQL-Query-Time-Ms"
+REPEATED_HEADER = "X-SQL-Repeated"
+
+# Longest statement shape echoed in the repeated-queries header
+HEADER_SHAPE_LENGTH = 120
+
+_WHITESPACE = re.compile(r"\s+")
+# "IN (?, ?, ?)" / "IN (%(id_1)s, ...)" / "IN ($1, $2)" -> "IN (...)"
+_IN_LIST = re.compile(r"\bIN \((?:\s*(?:\?|%\(\w+\)s|\$\d+|:\w+)\s*,?)+\)", re.IGNORECASE)
+
+
+def statement_shape(statement: str) -> str:
+    """Normalise a statement so executions differing only in parameters match."""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    return _IN_LIST.sub("IN (...)", shape)
+
+
+class QueryProfile:
+    """Statements recorded for one request or `max_queries` block."""
+
+    def __init__(self):
+        self.statements: list[tuple[str, float]] = []
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.statements.append((statement, seconds))
+        self.shapes[statement_shape(statement)] += 1
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(seconds for _, seconds in self.statements)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Shapes executed at least `threshold` times, most frequent first."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+    def report(self) -> str:
+        """Multi-line listing of every statement with its duration."""
+        lines = [f"{self.count} queries in {self.total_seconds * 1000:.1f} ms"]
+        lines.extend(
+            f"  {seconds * 1000:8.2f} ms  {statement_shape(statement)}"
+            for statement, seconds in self.statements
+        )
+        return "\n".join(lines)
+
+
+current_profile: contextvars.ContextVar[Optional[QueryProfile]] = contextvars.ContextVar(
+    "current_profile", default=None
+)
+
+
+def profile_engine(engine: Engine) -> None:
+    """Record statements run through an engine into the active profile, if any."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if current_profile.get() is not None:
+            conn.info.setdefault("profile_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        profile = current_profile.get()
+        starts = conn.info.get("profile_start")
+        if profile is not None and starts:
+            profile.record(statement, time.perf_counter() - starts.pop())
+
+
+@contextmanager
+def max_queries(limit: int) -> Iterator[QueryProfile]:
+    """
+    Fail with AssertionError if the block runs more than `limit` statements.
+    Statements are recorded through a context variable, so the app must run
+    in-process in this context (TestClient or httpx's ASGITransport).
+    """
+    profile = QueryProfile()
+    token = current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        current_profile.reset(token)
+    if profile.count > limit:
+        raise AssertionError(f"Expected at most {limit} queries, got {profile.report()}")
+
+
+def _profiling_requested(scope) -> bool:
+    if settings.SQL_PROFILING_ENABLED:
+        return True
+    if not settings.SQL_PROFILING_ALLOW_HEADER:
+        return False
+    for name, value in scope["headers"]:
+        if name == PROFILE_REQUEST_HEADER.encode():
+            return value.strip() in (b"1", b"true")
+    return False
+
+
+class SQLProfilerMiddleware:
+    """ASGI middleware that profiles SQL for requests that opt in."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _profiling_requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile()
+        token = current_profile.set(profile)
+        threshold = settings.SQL_PROFILING_REPEAT_THRESHOLD
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                # Statements run while streaming the body are only in the log
+                headers = list(message.get("headers", []))
+                headers.append((QUERY_COUNT_HEADER.encode(), str(profile.count).encode()))
+                headers.append((QUERY_TIME_HEADER.encode(), f"{profile.total_seconds * 1000:.2f}".encode()))
+                repeated = profile.repeated(threshold)
+                if repeated:
+                    summary = "; ".join(f"{count}x {shape[:HEADER_SHAPE_LENGTH]}" for shape, count in repeated)
+                    headers.append((REPEATED_HEADER.encode(), summary.encode("latin-1", "replace")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_profile.reset(token)
+            request_line = f"{scope['method']} {scope['path']}"
+            logger.info(f"SQL profile for {request_line}: {profile.report()}")
+            for shape, count in profile.repeated(threshold):
+                logger.warning(f"Possible N+1 in {request_line}: {count}x {shape}")
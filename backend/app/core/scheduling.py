@@ -0,0 +1,154 @@
+"""
+Set-based, idempotent screening scheduler.
+
+Every day offers a fixed grid of slots: each showtime template in each of
+the SCREENING_HALLS halls. The scheduler gives every movie one slot per day,
+rotating the slot order by date so movies cycle through showtimes and halls;
+when movies outnumber the slots, the ones left out rotate by date as well.
+Existing screenings in the horizon are loaded in a single query, and each
+day only hands free slots to movies not already showing that day, so
+admin-created screenings are worked around and re-running is a no-op.
+Missing rows are bulk-inserted in one statement that ignores conflicts on
+the unique (hall, time) key, so overlapping runs never double-book a hall.
+"""
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Collection, Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import Insert
+
+from app.core.config import settings
+from app.models.user import Movie, Screening
+
+logger = logging.getLogger(__name__)
+
+# Columns of the unique_screening_slot index
+SLOT_COLUMNS = ("hall", "show_datetime")
+
+
+@dataclass(frozen=True)
+class ShowtimeTemplate:
+    """A daily showtime and its ticket price."""
+
+    start: time
+    price: Decimal
+
+
+def showtime_templates() -> list[ShowtimeTemplate]:
+    """Parse SCREENING_SHOWTIMES ("HH:MM" -> price) into templates ordered by time."""
+    return sorted(
+        (ShowtimeTemplate(time.fromisoformat(start), Decimal(price)) for start, price in settings.SCREENING_SHOWTIMES.items()),
+        key=lambda template: template.start,
+    )
+
+
+def plan_day(
+    day: date,
+    movie_ids: list[int],
+    templates: list[ShowtimeTemplate],
+    halls: int,
+    total_seats: int,
+    occupied: Collection[tuple[int, datetime]] = (),
+    showing: Collection[int] = (),
+) -> list[dict]:
+    """
+    Target screenings for one day: each movie not in `showing` gets one of
+    the (hall, time) slots not in `occupied`, while slots last.
+    """
+    free = [
+        (hall, datetime.combine(day, template.start), template.price)
+        for hall in range(1, halls + 1)
+        for template in templates
+        if (hall, datetime.combine(day, template.start)) not in occupied
+    ]
+    pending = [movie_id for movie_id in movie_ids if movie_id not in showing]
+    if not free or not pending:
+        return []
+
+    # Shift slots by one a day, so a movie moves to the next showtime (and
+    # eventually hall); shift movies by a day's worth of slots, so the ones
+    # that don't fit are different every day
+    ordinal = day.toordinal()
+    shift = ordinal % len(free)
+    free = free[shift:] + free[:shift]
+    shift = ordinal * len(free) % len(pending)
+    pending = pending[shift:] + pending[:shift]
+    return [
+        {
+            "movie_id": movie_id,
+            "show_datetime": start,
+            "hall": hall,
+            "total_seats": total_seats,
+            "price": price,
+        }
+        for movie_id, (hall, start, price) in zip(pending, free)
+    ]
+
+
+def insert_ignoring_conflicts(db: Session) -> Insert:
+    """INSERT into screenings that skips rows already holding their slot."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        # The diff already excludes existing rows; only concurrent runs can conflict
+        return insert(Screening)
+    return dialect_insert(Screening).on_conflict_do_nothing(index_elements=list(SLOT_COLUMNS))
+
+
+def schedule_screenings(db: Session, now: Optional[datetime] = None) -> int:
+    """Create any missing screenings for the scheduling horizon. Returns how many were inserted."""
+    templates = showtime_templates()
+    if not templates:
+        logger.warning("No showtime templates configured, cannot schedule screenings")
+        return 0
+
+    movie_ids = list(db.scalars(select(Movie.id).order_by(Movie.id)))
+    if not movie_ids:
+        logger.warning("No movies found, cannot create screenings")
+        return 0
+
+    days = settings.SCREENING_HORIZON_DAYS
+    first_day = (now or datetime.utcnow()).date() + timedelta(days=1)
+    window_start = datetime.combine(first_day, time.min)
+    window_end = window_start + timedelta(days=days)
+
+    # One query for everything already scheduled in the window
+    occupied: dict[date, set[tuple[int, datetime]]] = defaultdict(set)
+    showing: dict[date, set[int]] = defaultdict(set)
+    for movie_id, show_datetime, hall in db.execute(
+        select(Screening.movie_id, Screening.show_datetime, Screening.hall).where(
+            Screening.show_datetime >= window_start,
+            Screening.show_datetime < window_end,
+        )
+    ):
+        occupied[show_datetime.date()].add((hall, show_datetime))
+        showing[show_datetime.date()].add(movie_id)
+
+    missing = []
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        missing.extend(plan_day(
+            day,
+            movie_ids,
+            templates,
+            settings.SCREENING_HALLS,
+            settings.SCREENING_TOTAL_SEATS,
+            occupied[day],
+            showing[day],
+        ))
+    if not missing:
+        logger.info(f"Schedule for the next {days} days is complete")
+        return 0
+
+    db.execute(insert_ignoring_conflicts(db), missing)
+    db.commit()
+    logger.info(f"Scheduled {len(missing)} new screenings for the next {days} days")
+    return len(missing)
@@ -0,0 +1,127 @@
+"""
+Compact per-screening seat occupancy maps.
+
+Each screening's taken seats are kept as a bitset indexed by seat position,
+so availability checks are O(1) per seat and the seats endpoint can answer
+without loading reservation rows. Maps are loaded lazily with one query,
+updated in place when bookings commit, and reloaded after a TTL so changes
+made by other workers are picked up.
+"""
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.layout import SeatLayout
+from app.models.user import Reservation
+
+class SeatMap:
+    """Bitset of taken seats for a single screening."""
+
+    __slots__ = ("layout", "taken_count", "loaded_at", "_bits")
+
+    def __init__(self, layout: SeatLayout):
+        self.layout = layout
+        self.taken_count = 0
+        self.loaded_at = time.monotonic()
+        self._bits = bytearray((layout.total_seats + 7) // 8)
+
+    def is_taken(self, index: int) -> bool:
+        return bool(self._bits[index >> 3] & (1 << (index & 7)))
+
+    def mark_taken(self, index: int) -> None:
+        if not self.is_taken(index):
+            self._bits[index >> 3] |= 1 << (index & 7)
+            self.taken_count += 1
+
+    def release(self, index: int) -> None:
+        if self.is_taken(index):
+            self._bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+            self.taken_count -= 1
+
+
+class SeatMapRegistry:
+    """Process-wide, size-bounded cache of seat maps keyed by screening id."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._maps: "OrderedDict[int, SeatMap]" = OrderedDict()
+        # Screening id -> [changes seen, loads running], kept only while a load
+        # is in flight, so a load racing a booking is not cached
+        self._in_flight: dict[int, list[int]] = {}
+
+    def peek(self, screening_id: int) -> Optional[SeatMap]:
+        """Return the cached map if it is still fresh, without touching the DB."""
+        seat_map = self._maps.get(screening_id)
+        if seat_map is None:
+            return None
+        if time.monotonic() - seat_map.loaded_at > self.ttl_seconds:
+            del self._maps[screening_id]
+            return None
+        self._maps.move_to_end(screening_id)
+        return seat_map
+
+    async def get(self, db: AsyncSession, screening_id: int, layout: SeatLayout) -> SeatMap:
+        """Return the screening's seat map, loading it with one query on a miss."""
+        seat_map = self.peek(screening_id)
+        if seat_map is not None and seat_map.layout is layout:
+            return seat_map
+
+        load = self._in_flight.setdefault(screening_id, [0, 0])
+        load[1] += 1
+        changes = load[0]
+        try:
+            result = await db.scalars(select(Reservation.seat_number).where(
+                Reservation.screening_id == screening_id,
+                Reservation.status == "active"
+            ))
+
+            seat_map = SeatMap(layout)
+            for seat_number in result:
+                index = layout.index_of(seat_number)
+                if index is not None:
+                    seat_map.mark_taken(index)
+        finally:
+            load[1] -= 1
+            if not load[1]:
+                del self._in_flight[screening_id]
+
+        if load[0] == changes:
+            self._maps[screening_id] = seat_map
+            self._maps.move_to_end(screening_id)
+            while len(self._maps) > self.max_entries:
+                self._maps.popitem(last=False)
+        return seat_map
+
+    def _changed(self, screening_id: int) -> None:
+        load = self._in_flight.get(screening_id)
+        if load is not None:
+            load[0] += 1
+
+    def mark_taken(self, screening_id: int, index: int) -> None:
+        self._changed(screening_id)
+        seat_map = self._maps.get(screening_id)
+        if seat_map is not None:
+            seat_map.mark_taken(index)
+
+    def release(self, screening_id: int, seat_number: str) -> None:
+        self._changed(screening_id)
+        seat_map = self._maps.get(screening_id)
+        if seat_map is not None:
+            index = seat_map.layout.index_of(seat_number)
+            if index is not None:
+                seat_map.release(index)
+
+    def invalidate(self, screening_id: int) -> None:
+        self._changed(screening_id)
+        self._maps.pop(screening_id, None)
+
+
+seat_maps = SeatMapRegistry(
+    ttl_seconds=settings.SEAT_MAP_TTL_SECONDS,
+    max_entries=settings.SEAT_MAP_MAX_SCREENINGS,
+)
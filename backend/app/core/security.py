@@ -1,5 +1,9 @@
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional
+import hmac
+import time
 import bcrypt
 
 from jose import JWTError, jwt
@@ -8,6 +12,7 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 
 from app.core.config import settings
+from app.core.workers import BoundedWorkerPool, WorkerPoolSaturated
 
 # pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
@@ -27,7 +32,49 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     """Hash a password."""
-    return bcrypt.hashpw(bytes(password, encoding='utf-8'), bcrypt.gensalt()).decode('utf-8')
+    return bcrypt.hashpw(
+        bytes(password, encoding='utf-8'),
+        bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
+    ).decode('utf-8')
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check whether a hash was made with a different work factor than configured."""
+    # bcrypt hashes look like $2b$12$<salt+digest>; the third field is the cost
+    try:
+        rounds = int(hashed_password.split('$')[2])
+    except (IndexError, ValueError):
+        return True
+    return rounds != settings.BCRYPT_ROUNDS
+
+
+password_pool = BoundedWorkerPool(
+    "bcrypt",
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queued=settings.PASSWORD_HASH_QUEUE_SIZE,
+)
+
+
+async def _run_password_job(fn, *args):
+    """Run a bcrypt call off the event loop, shedding load with 503 when saturated."""
+    try:
+        return await password_pool.run(fn, *args)
+    except WorkerPoolSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the bcrypt worker pool."""
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the bcrypt worker pool."""
+    return await _run_password_job(get_password_hash, password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -48,12 +95,86 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-from sqlalchemy.orm import Session
-from app.database.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.database import get_async_db
 from app.models.user import User
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+
+@dataclass(frozen=True)
+class Principal:
+    """Immutable snapshot of the authenticated user, safe to share across requests."""
+
+    id: int
+    email: str
+    role: str
+    created_at: Optional[datetime] = None
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(id=user.id, email=user.email, role=user.role, created_at=user.created_at)
+
+
+class TokenCache:
+    """Bounded LRU cache of verified tokens to principals with per-entry expiry."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple[Principal, float]]" = OrderedDict()
+        self._tokens_by_user: dict[int, set[str]] = {}
+
+    def get(self, token: str) -> Optional[Principal]:
+        entry = self._entries.get(token)
+        if entry is None:
+            return None
+        principal, expires_at = entry
+        if expires_at <= time.time():
+            self._discard(token)
+            return None
+        self._entries.move_to_end(token)
+        return principal
+
+    def put(self, token: str, principal: Principal, token_expires_at: Optional[float]) -> None:
+        """Cache a verified token until the cache TTL or the token's own expiry."""
+        expires_at = time.time() + self.ttl_seconds
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+        self._discard(token)
+        self._entries[token] = (principal, expires_at)
+        self._tokens_by_user.setdefault(principal.id, set()).add(token)
+        while len(self._entries) > self.max_entries:
+            self._discard(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every cached token for a user, e.g. after an update or delete."""
+        for token in self._tokens_by_user.pop(user_id, set()):
+            self._entries.pop(token, None)
+
+    def _discard(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        tokens = self._tokens_by_user.get(entry[0].id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[entry[0].id]
+
+
+token_cache = TokenCache(
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+)
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> Principal:
     """Get the current authenticated user from JWT token."""
+    # Tokens are only cached after verification, so a hit skips decoding and the DB
+    principal = token_cache.get(token)
+    if principal is not None:
+        return principal
+    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -68,14 +189,16 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    user = await db.scalar(select(User).where(User.id == int(user_id)))
     if user is None:
         raise credentials_exception
-        
-    return user
+    
+    principal = Principal.from_user(user)
+    token_cache.put(token, principal, payload.get("exp"))
+    return principal
 
 
-async def get_current_admin_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_admin_user(current_user: Principal = Depends(get_current_user)) -> Principal:
     """Validate that the current user has admin privileges."""
     if current_user.role != "admin":
         raise HTTPException(
@@ -83,3 +206,13 @@ async def get_current_admin_user(current_user: User = Depends(get_current_user))
             detail="The user does not have enough privileges"
         )
     return current_user
+
+
+async def get_monitoring_access(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> None:
+    """Allow monitoring endpoints for the configured METRICS_TOKEN or an admin user."""
+    if settings.METRICS_TOKEN and hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+        return
+    await get_current_admin_user(await get_current_user(token, db))
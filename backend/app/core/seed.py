@@ -3,10 +3,10 @@ Seed data and background tasks for the movie reservation system.
 """
 import asyncio
 import logging
-from datetime import datetime, timedelta
-from decimal import Decimal
 from sqlalchemy.orm import Session
 
+from app.core.cache import MOVIES, SCREENINGS, catalog_cache
+from app.core.scheduling import schedule_screenings
 from app.database.database import SessionLocal
 from app.models.user import Movie, Screening
 
@@ -68,65 +68,6 @@ def seed_movies(db: Session) -> list[Movie]:
     return movies
 
 
-def create_weekly_screenings(db: Session) -> list[Screening]:
-    """Create screenings for the next 7 days if none exist for upcoming dates."""
-    now = datetime.utcnow()
-    
-    # Check if there are any future screenings
-    future_screenings = db.query(Screening).filter(
-        Screening.show_datetime > now
-    ).count()
-    
-    if future_screenings >= 5:
-        logger.info(f"Already have {future_screenings} future screenings, skipping creation")
-        return []
-    
-    # Get all movies
-    movies = db.query(Movie).all()
-    if not movies:
-        logger.warning("No movies found, cannot create screenings")
-        return []
-    
-    screenings = []
-    showtimes = ["10:00", "14:00", "18:00", "21:00"]
-    prices = [Decimal("10.00"), Decimal("12.50"), Decimal("15.00"), Decimal("12.50")]
-    
-    # Create screenings for the next 7 days
-    for day_offset in range(1, 8):
-        date = now + timedelta(days=day_offset)
-        
-        for i, movie in enumerate(movies):
-            # Each movie gets one showtime per day, rotating through showtimes
-            showtime_idx = (day_offset + i) % len(showtimes)
-            hour, minute = map(int, showtimes[showtime_idx].split(":"))
-            
-            show_datetime = date.replace(hour=hour, minute=minute, second=0, microsecond=0)
-            
-            # Check if this screening already exists
-            existing = db.query(Screening).filter(
-                Screening.movie_id == movie.id,
-                Screening.show_datetime == show_datetime
-            ).first()
-            
-            if existing:
-                continue
-            
-            screening = Screening(
-                movie_id=movie.id,
-                show_datetime=show_datetime,
-                total_seats=100,
-                price=prices[showtime_idx]
-            )
-            db.add(screening)
-            screenings.append(screening)
-    
-    if screenings:
-        db.commit()
-        logger.info(f"Created {len(screenings)} new screenings for the week")
-    
-    return screenings
-
-
 def seed_initial_data():
     """Seed initial data on application startup."""
     db = SessionLocal()
@@ -134,8 +75,9 @@ def seed_initial_data():
         # Seed movies
         movies = seed_movies(db)
         
-        # Create weekly screenings
-        create_weekly_screenings(db)
+        # Schedule screenings for the coming days
+        schedule_screenings(db)
+        catalog_cache.invalidate(MOVIES, SCREENINGS)
         
         logger.info("Initial data seeding complete")
     except Exception as e:
@@ -145,23 +87,17 @@ def seed_initial_data():
         db.close()
 
 
-async def weekly_screening_task():
-    """Background task that creates new screenings weekly."""
-    while True:
-        try:
-            # Wait 24 hours before checking again
-            await asyncio.sleep(24 * 60 * 60)  # 24 hours
-            
-            db = SessionLocal()
-            try:
-                create_weekly_screenings(db)
-            finally:
-                db.close()
-                
-        except asyncio.CancelledError:
-            logger.info("Weekly screening task cancelled")
-            break
-        except Exception as e:
-            logger.error(f"Error in weekly screening task: {e}")
-            # Wait a bit before retrying on errors
-            await asyncio.sleep(60)
+def _top_up_screenings():
+    """Top up the screening schedule in a short-lived session."""
+    db = SessionLocal()
+    try:
+        schedule_screenings(db)
+    finally:
+        db.close()
+
+
+async def screening_schedule_job():
+    """Scheduled job that keeps the screening schedule filled for the horizon."""
+    # Run the sync scheduling session off the event loop
+    await asyncio.to_thread(_top_up_screenings)
+    catalog_cache.invalidate(MOVIES, SCREENINGS)
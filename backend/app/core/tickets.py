@@ -0,0 +1,268 @@
+"""
+PDF ticket rendering and caching.
+
+Tickets are rendered on a bounded worker pool so FPDF never runs on the
+event loop. Rendered bytes are cached in memory under a digest of the
+ticket's contents, which doubles as the ETag; entries are evicted LRU by
+total size and dropped when a reservation is cancelled.
+"""
+import asyncio
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+from fpdf import FPDF
+
+from app.core.config import settings
+from app.core.workers import BoundedWorkerPool, WorkerPoolSaturated
+
+
+@dataclass(frozen=True)
+class TicketData:
+    """Plain snapshot of everything printed on a ticket, safe to hand to a worker thread."""
+
+    reservation_id: int
+    seat_number: str
+    created_at: Optional[datetime]
+    show_datetime: datetime
+    price: Decimal
+    movie_title: str
+    movie_genre: str
+    user_email: str
+
+    @classmethod
+    def from_rows(cls, reservation, screening, movie, user_email: str) -> "TicketData":
+        return cls(
+            reservation_id=reservation.id,
+            seat_number=reservation.seat_number,
+            created_at=reservation.created_at,
+            show_datetime=screening.show_datetime,
+            price=screening.price,
+            movie_title=movie.title if movie else "Unknown Movie",
+            movie_genre=movie.genre if movie else "N/A",
+            user_email=user_email,
+        )
+
+    @property
+    def digest(self) -> str:
+        """Content address of the ticket; changes whenever any printed field does."""
+        return hashlib.sha256(repr(self).encode()).hexdigest()
+
+
+def draw_ticket_page(pdf: FPDF, ticket: TicketData) -> None:
+    """Add one ticket page to a PDF document."""
+    pdf.add_page()
+
+    # Header
+    pdf.set_font("Helvetica", "B", 24)
+    pdf.set_text_color(0, 102, 204)
+    pdf.cell(0, 20, "MOVIE TICKET", align="C", ln=True)
+
+    # Divider line
+    pdf.set_draw_color(0, 102, 204)
+    pdf.set_line_width(1)
+    pdf.line(20, 35, 190, 35)
+
+    pdf.ln(10)
+
+    # Ticket details
+    pdf.set_font("Helvetica", "B", 14)
+    pdf.set_text_color(0, 0, 0)
+    pdf.cell(0, 10, "Movie: " + ticket.movie_title, ln=True)
+
+    pdf.set_font("Helvetica", "", 12)
+    pdf.cell(0, 8, "Genre: " + ticket.movie_genre, ln=True)
+
+    pdf.ln(5)
+    pdf.set_font("Helvetica", "B", 12)
+    pdf.cell(0, 8, "Screening Details:", ln=True)
+
+    pdf.set_font("Helvetica", "", 12)
+    show_date = ticket.show_datetime.strftime("%B %d, %Y")
+    show_time = ticket.show_datetime.strftime("%I:%M %p")
+    pdf.cell(0, 8, "Date: " + show_date, ln=True)
+    pdf.cell(0, 8, "Time: " + show_time, ln=True)
+
+    pdf.ln(5)
+    pdf.set_font("Helvetica", "B", 16)
+    pdf.set_text_color(0, 128, 0)
+    pdf.cell(0, 10, "SEAT: " + ticket.seat_number, ln=True)
+
+    pdf.set_text_color(0, 0, 0)
+    pdf.set_font("Helvetica", "", 12)
+    pdf.cell(0, 8, "Price: $" + str(ticket.price), ln=True)
+
+    pdf.ln(10)
+
+    # Booking details box
+    pdf.set_fill_color(240, 240, 240)
+    pdf.rect(20, pdf.get_y(), 170, 35, "F")
+
+    pdf.set_font("Helvetica", "B", 10)
+    pdf.set_xy(25, pdf.get_y() + 5)
+    pdf.cell(0, 6, "BOOKING INFORMATION", ln=True)
+
+    pdf.set_font("Helvetica", "", 10)
+    pdf.set_x(25)
+    pdf.cell(0, 6, "Booking ID: RES-" + str(ticket.reservation_id).zfill(6), ln=True)
+    pdf.set_x(25)
+    pdf.cell(0, 6, "Email: " + ticket.user_email, ln=True)
+    pdf.set_x(25)
+    booked_date = ticket.created_at.strftime("%Y-%m-%d %H:%M") if ticket.created_at else "N/A"
+    pdf.cell(0, 6, "Booked on: " + booked_date, ln=True)
+
+    pdf.ln(20)
+
+    # Footer
+    pdf.set_font("Helvetica", "I", 10)
+    pdf.set_text_color(128, 128, 128)
+    pdf.cell(0, 6, "Please present this ticket at the entrance.", align="C", ln=True)
+    pdf.cell(0, 6, "Thank you for choosing our cinema!", align="C", ln=True)
+
+
+def pdf_to_bytes(pdf: FPDF) -> bytes:
+    """Serialize a finished PDF document."""
+    # fpdf 1.7.x: output(dest='S') returns a string, encode to bytes
+    pdf_content = pdf.output(dest='S')
+    if isinstance(pdf_content, str):
+        return pdf_content.encode('latin-1')
+    return pdf_content
+
+
+def generate_ticket_pdf(ticket: TicketData) -> bytes:
+    """Generate a PDF ticket for a reservation."""
+    pdf = FPDF()
+    draw_ticket_page(pdf, ticket)
+    return pdf_to_bytes(pdf)
+
+
+def generate_tickets_pdf(tickets: list[TicketData]) -> bytes:
+    """Generate one PDF with a page per ticket."""
+    pdf = FPDF()
+    for ticket in tickets:
+        draw_ticket_page(pdf, ticket)
+    return pdf_to_bytes(pdf)
+
+
+class ZipStreamBuffer:
+    """
+    Write-only file object for zipfile that hands out bytes as they are written.
+    zipfile falls back to streaming mode (data descriptors) because it cannot seek.
+    """
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        """Return and forget everything written since the last drain."""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class TicketCache:
+    """In-memory LRU of rendered tickets bounded by total bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        # Digest -> (reservation id, PDF bytes)
+        self._entries: "OrderedDict[str, tuple[int, bytes]]" = OrderedDict()
+        self._digests_by_reservation: dict[int, set[str]] = {}
+
+    def get(self, digest: str) -> Optional[bytes]:
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+        self._entries.move_to_end(digest)
+        return entry[1]
+
+    def put(self, reservation_id: int, digest: str, content: bytes) -> None:
+        if len(content) > self.max_bytes or digest in self._entries:
+            return
+        self._entries[digest] = (reservation_id, content)
+        self.size_bytes += len(content)
+        self._digests_by_reservation.setdefault(reservation_id, set()).add(digest)
+        while self.size_bytes > self.max_bytes:
+            evicted_digest, (evicted_reservation, evicted) = self._entries.popitem(last=False)
+            self.size_bytes -= len(evicted)
+            digests = self._digests_by_reservation.get(evicted_reservation)
+            if digests is not None:
+                digests.discard(evicted_digest)
+                if not digests:
+                    del self._digests_by_reservation[evicted_reservation]
+
+    def invalidate(self, reservation_id: int) -> None:
+        """Drop every cached rendering of a reservation, e.g. on cancel."""
+        for digest in self._digests_by_reservation.pop(reservation_id, set()):
+            entry = self._entries.pop(digest, None)
+            if entry is not None:
+                self.size_bytes -= len(entry[1])
+
+
+ticket_cache = TicketCache(max_bytes=settings.TICKET_CACHE_MAX_BYTES)
+
+ticket_pool = BoundedWorkerPool(
+    "ticket-pdf",
+    max_workers=settings.TICKET_RENDER_WORKERS,
+    max_queued=settings.TICKET_RENDER_QUEUE_SIZE,
+)
+
+# Renders in progress, so concurrent downloads of one ticket share a render
+_pending_renders: dict[str, asyncio.Future] = {}
+
+
+async def render_ticket(ticket: TicketData, wait: bool = False) -> bytes:
+    """
+    Return the ticket PDF from cache, rendering it on the worker pool on a miss.
+    A full pool raises WorkerPoolSaturated, unless wait is set, in which case
+    the render waits for a free worker.
+    """
+    digest = ticket.digest
+    content = ticket_cache.get(digest)
+    if content is not None:
+        return content
+
+    pending = _pending_renders.get(digest)
+    if pending is not None:
+        try:
+            return await asyncio.shield(pending)
+        except WorkerPoolSaturated:
+            # The shared render was rejected; render it ourselves
+            if not wait:
+                raise
+            return await render_ticket(ticket, wait=True)
+
+    future = asyncio.get_running_loop().create_future()
+    _pending_renders[digest] = future
+    try:
+        run = ticket_pool.run_when_free if wait else ticket_pool.run
+        content = await run(generate_ticket_pdf, ticket)
+        ticket_cache.put(ticket.reservation_id, digest, content)
+        future.set_result(content)
+        return content
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Mark the exception as retrieved when nobody else was waiting on it
+        future.exception()
+        raise
+    finally:
+        del _pending_renders[digest]
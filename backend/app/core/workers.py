@@ -0,0 +1,97 @@
+"""
+Bounded worker pools for blocking work called from async handlers.
+
+CPU-heavy or blocking calls (password hashing, PDF rendering) run on a
+dedicated thread pool so they never stall the event loop. Each pool caps
+the number of running plus queued jobs; once full, new work is rejected
+immediately instead of piling up behind a backlog. Callers that cannot
+fail halfway, such as a response that is already streaming, can wait for a
+free slot instead. Job durations, rejections and in-flight counts are
+exported as metrics per pool.
+"""
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, TypeVar
+
+from app.core.metrics import worker_job_duration_seconds, worker_jobs_in_flight, worker_jobs_rejected_total
+
+T = TypeVar("T")
+
+
+class WorkerPoolSaturated(Exception):
+    """Raised when a pool has no free worker or queue slot."""
+
+    def __init__(self, pool_name: str):
+        super().__init__(f"Worker pool '{pool_name}' is saturated")
+        self.pool_name = pool_name
+
+
+class BoundedWorkerPool:
+    """Thread pool with backpressure on running plus queued jobs."""
+
+    def __init__(self, name: str, max_workers: int, max_queued: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.capacity = max_workers + max_queued
+        self.in_flight = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        # Callers of run_when_free waiting for a slot, woken one per finished job
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def full(self) -> bool:
+        """Whether new work would be rejected right now."""
+        return self.in_flight >= self.capacity
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run fn in the pool, raising WorkerPoolSaturated if it is full."""
+        if self.full:
+            worker_jobs_rejected_total.inc(self.name)
+            raise WorkerPoolSaturated(self.name)
+
+        # Only touched from the event loop thread, so no lock is needed
+        self.in_flight += 1
+        worker_jobs_in_flight.inc(self.name)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(self._timed, fn, *args, **kwargs))
+        finally:
+            self.in_flight -= 1
+            worker_jobs_in_flight.dec(self.name)
+            self._wake_next()
+
+    async def run_when_free(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run fn in the pool, waiting for a free slot instead of raising when it is full."""
+        while self.full:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Pass on a wake-up this caller can no longer use
+                if waiter.done() and not waiter.cancelled():
+                    self._wake_next()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        return await self.run(fn, *args, **kwargs)
+
+    def _wake_next(self) -> None:
+        """Wake the longest-waiting run_when_free caller, if any."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    def _timed(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run fn on the worker thread, recording how long it took (excluding queueing)."""
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            worker_job_duration_seconds.observe(time.perf_counter() - start, self.name)
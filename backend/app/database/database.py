@@ -1,27 +1,122 @@
+"""
+Engines and session factories.
+
+Nothing here connects, or even builds an engine, at import time: engines
+are created on first use and schema creation is an explicit step
+(`python -m app.cli init-db`), so worker start-up stays fast.
+"""
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.core.profiling import profile_engine
+from app.database.pool import PoolMetrics, engine_options, track_pool_events
 
-print(settings.DATABASE_URL)
+# Async drivers used for each sync dialect in DATABASE_URL.
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+
+def get_async_database_url(database_url: str) -> str:
+    """Translate a sync database URL into its async driver equivalent."""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+class LazySessionmaker:
+    """Session factory that builds its engine and sessionmaker on first use."""
+
+    def __init__(self, build: Callable[[], Callable[..., Any]]):
+        self._build = build
+        self._factory: Optional[Callable[..., Any]] = None
+
+    def __call__(self, **kwargs):
+        if self._factory is None:
+            self._factory = self._build()
+        return self._factory(**kwargs)
+
+
+pool_metrics = PoolMetrics("sync")
+async_pool_metrics = PoolMetrics("async")
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True
-)
 
-SessionLocal = sessionmaker(
+@lru_cache(maxsize=None)
+def get_engine() -> Engine:
+    """The sync engine, created on first use so importing the app never touches the database."""
+    engine = create_engine(
+        settings.DATABASE_URL,
+        echo=settings.DEBUG,
+        future=True,
+        **engine_options(settings.DATABASE_URL, pool_metrics)
+    )
+    track_pool_events(engine, pool_metrics)
+    instrument_engine(engine, pool_metrics.name)
+    profile_engine(engine)
+    return engine
+
+
+@lru_cache(maxsize=None)
+def get_async_engine() -> AsyncEngine:
+    """The async engine, created on first use."""
+    async_database_url = settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL)
+    async_engine = create_async_engine(
+        async_database_url,
+        echo=settings.DEBUG,
+        **engine_options(async_database_url, async_pool_metrics)
+    )
+    track_pool_events(async_engine.sync_engine, async_pool_metrics)
+    instrument_engine(async_engine.sync_engine, async_pool_metrics.name)
+    profile_engine(async_engine.sync_engine)
+    return async_engine
+
+
+SessionLocal = LazySessionmaker(lambda: sessionmaker(
     autocommit=False,
     autoflush=False,
-    bind=engine,
+    bind=get_engine(),
     future=True
-)
+))
+
+AsyncSessionLocal = LazySessionmaker(lambda: async_sessionmaker(
+    bind=get_async_engine(),
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+))
 
 Base = declarative_base()
 
 
+def init_db() -> None:
+    """Create any missing tables. Safe to run from several workers at once."""
+    # Importing the models registers their tables on Base
+    import app.models.user  # noqa: F401
+    # Another process may create a table between the existence check and
+    # CREATE TABLE; each failure means one more table exists, so retrying
+    # makes progress and the last attempt can only fail for real reasons
+    attempts = len(Base.metadata.tables) + 1
+    for attempt in range(1, attempts + 1):
+        try:
+            Base.metadata.create_all(bind=get_engine())
+            return
+        except DBAPIError:
+            if attempt == attempts:
+                raise
+
+
 def get_db():
     """Get database session."""
     db = SessionLocal()
@@ -29,3 +124,15 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    Get async database session.
+    The session only holds a pooled connection while a transaction is open;
+    routes that do slow non-database work (hashing, rendering, streaming)
+    should commit or `await db.close()` first so the connection is returned
+    early. The session can still be used afterwards and reconnects lazily.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,134 @@
+"""
+Connection pool configuration and instrumentation.
+
+Engines are built with pool sizing, overflow, timeout, recycle and pre-ping
+taken from settings. Each engine's pool class is a thin subclass of the
+dialect's default that times how long callers wait for a connection, and
+pool events track checkouts, checkins, new connections and invalidations,
+so pool exhaustion shows up as numbers rather than as slow requests.
+"""
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import Pool, QueuePool
+
+from app.core.config import settings
+
+
+class PoolMetrics:
+    """Counters and timings for one connection pool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.checked_out = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.hold_seconds_total = 0.0
+
+    def observe_wait(self, seconds: float, timed_out: bool) -> None:
+        with self._lock:
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def on_checkout(self) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+
+    def on_checkin(self, held_seconds: float) -> None:
+        with self._lock:
+            self.checkins += 1
+            self.checked_out -= 1
+            self.hold_seconds_total += held_seconds
+
+    def on_connect(self) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def on_invalidate(self) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "checked_out": self.checked_out,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+                "hold_seconds_total": round(self.hold_seconds_total, 6),
+            }
+
+
+def instrumented_pool_class(base: type[Pool], metrics: PoolMetrics) -> type[Pool]:
+    """Subclass a pool class so every checkout records its wait time."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return base._do_get(self)
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            metrics.observe_wait(time.perf_counter() - start, timed_out)
+
+    return type(f"Instrumented{base.__name__}", (base,), {"_do_get": _do_get})
+
+
+def engine_options(database_url: str, metrics: PoolMetrics) -> dict[str, Any]:
+    """Pool keyword arguments for create_engine / create_async_engine."""
+    url = make_url(database_url)
+    base = url.get_dialect().get_pool_class(url)
+    options: dict[str, Any] = {
+        "poolclass": instrumented_pool_class(base, metrics),
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+    }
+    # Sizing only applies to queue pools (not e.g. SQLite's in-memory pool)
+    if issubclass(base, QueuePool):
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        )
+    return options
+
+
+def track_pool_events(engine: Engine, metrics: PoolMetrics) -> None:
+    """Record checkout/checkin/connect/invalidate events for an engine's pool."""
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.on_connect()
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+        metrics.on_checkout()
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            metrics.on_checkin(time.perf_counter() - checked_out_at)
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.on_invalidate()
@@ -0,0 +1,220 @@
+"""
+Read-replica routing for read-only endpoints.
+
+When READ_REPLICA_URLS is set, read-only routes take their session from
+`get_read_db`, which spreads them round-robin over healthy replicas. A
+replica that fails to hand out a connection is taken out of rotation for a
+cooldown and the request moves on to the next one, falling back to the
+primary when none is available; a background task probes failed replicas
+and puts them back once they answer. With no replicas configured
+everything goes to the primary.
+
+Clients that just wrote something are pinned to the primary for a short
+window so they read their own writes despite replication lag. The pin
+travels with the client as a signed cookie holding the window's end, so
+it holds whichever worker serves the next request. Clients that drop
+cookies (or cross-site browsers blocking third-party cookies) lose the
+guarantee and may briefly read stale data from a replica. The window is
+wall-clock time, so worker clocks should be kept in sync.
+
+Seat availability endpoints stay on the primary: they load the shared
+per-screening seat maps that booking uses to reject taken seats, and a
+lagging replica would keep freed seats looking taken for everyone.
+"""
+import asyncio
+import hashlib
+import hmac
+import itertools
+import logging
+import time
+from http.cookies import SimpleCookie
+from typing import AsyncIterator, Optional
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.core.profiling import profile_engine
+from app.database.database import AsyncSessionLocal, get_async_database_url
+from app.database.pool import PoolMetrics, engine_options, track_pool_events
+
+logger = logging.getLogger(__name__)
+
+# Methods that never write, so they don't pin the client to the primary
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+# Signed "<unix time>.<hmac>" until which the client's reads use the primary
+PIN_COOKIE = "primary_reads_until"
+
+
+class Replica:
+    """One read replica with its engine, session factory and health state."""
+
+    def __init__(self, index: int, database_url: str):
+        async_url = get_async_database_url(database_url)
+        self.name = f"replica-{index}"
+        self.metrics = PoolMetrics(self.name)
+        self.engine: AsyncEngine = create_async_engine(
+            async_url,
+            echo=settings.DEBUG,
+            **engine_options(async_url, self.metrics)
+        )
+        track_pool_events(self.engine.sync_engine, self.metrics)
+        instrument_engine(self.engine.sync_engine, self.name)
+        profile_engine(self.engine.sync_engine)
+        self.sessionmaker = async_sessionmaker(
+            bind=self.engine,
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+        self.unhealthy_until = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.unhealthy_until
+
+    def mark_failed(self) -> None:
+        self.unhealthy_until = time.monotonic() + settings.REPLICA_FAILURE_COOLDOWN_SECONDS
+
+
+class ReplicaRouter:
+    """Round-robin over healthy replicas."""
+
+    def __init__(self, database_urls: list[str]):
+        self.database_urls = list(database_urls)
+        self._replicas: Optional[list[Replica]] = None
+        self._next = itertools.count()
+
+    @property
+    def replicas(self) -> list[Replica]:
+        """Replica engines, created on first use."""
+        if self._replicas is None:
+            self._replicas = [Replica(index, url) for index, url in enumerate(self.database_urls)]
+        return self._replicas
+
+    def candidates(self) -> list[Replica]:
+        """Healthy replicas in round-robin order for this request."""
+        if not self.database_urls:
+            return []
+        start = next(self._next) % len(self.replicas)
+        ordered = self.replicas[start:] + self.replicas[:start]
+        return [replica for replica in ordered if replica.healthy]
+
+    async def dispose(self) -> None:
+        for replica in self._replicas or ():
+            await replica.engine.dispose()
+
+
+replica_router = ReplicaRouter(settings.READ_REPLICA_URLS)
+
+
+def _pin_signature(value: str) -> str:
+    return hmac.new(settings.SECRET_KEY.encode(), value.encode(), hashlib.sha256).hexdigest()
+
+
+def pin_cookie_value(until: float) -> str:
+    """Signed cookie value keeping reads on the primary until `until` (unix time)."""
+    value = f"{until:.3f}"
+    return f"{value}.{_pin_signature(value)}"
+
+
+def is_pinned(cookie: Optional[str]) -> bool:
+    """Whether a pin cookie is authentic and its window has not ended."""
+    if not cookie:
+        return False
+    value, _, signature = cookie.rpartition(".")
+    if not hmac.compare_digest(signature, _pin_signature(value)):
+        return False
+    try:
+        return float(value) > time.time()
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware:
+    """ASGI middleware pinning clients to the primary for a while after a successful write."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                window = settings.READ_YOUR_WRITES_SECONDS
+                cookie = SimpleCookie()
+                cookie[PIN_COOKIE] = pin_cookie_value(time.time() + window)
+                cookie[PIN_COOKIE]["max-age"] = max(int(window), 1)
+                cookie[PIN_COOKIE]["path"] = "/"
+                cookie[PIN_COOKIE]["httponly"] = True
+                if scope["scheme"] == "https":
+                    # Lets a frontend on another site send it back with credentialed requests
+                    cookie[PIN_COOKIE]["secure"] = True
+                    cookie[PIN_COOKIE]["samesite"] = "None"
+                else:
+                    cookie[PIN_COOKIE]["samesite"] = "Lax"
+                headers = list(message.get("headers", []))
+                headers.append((b"set-cookie", cookie.output(header="").strip().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+async def get_read_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """
+    Get a database session for read-only routes.
+    Uses a healthy replica when one is available and the client has not
+    written recently; otherwise the primary.
+    """
+    if not is_pinned(request.cookies.get(PIN_COOKIE)):
+        for replica in replica_router.candidates():
+            session = replica.sessionmaker()
+            try:
+                # Connect eagerly so a dead replica fails over before the route runs
+                await session.connection()
+            except (OperationalError, DBAPIError, OSError) as e:
+                await session.close()
+                replica.mark_failed()
+                logger.warning(f"Read replica {replica.name} unavailable, failing over: {e}")
+                continue
+            try:
+                yield session
+            finally:
+                await session.close()
+            return
+
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def replica_health_task():
+    """Background task that probes failed replicas and restores them."""
+    while True:
+        try:
+            await asyncio.sleep(settings.REPLICA_HEALTH_CHECK_INTERVAL_SECONDS)
+
+            for replica in replica_router.replicas:
+                if replica.healthy:
+                    continue
+                try:
+                    async with replica.engine.connect() as conn:
+                        await conn.execute(text("SELECT 1"))
+                except Exception as e:
+                    replica.mark_failed()
+                    logger.warning(f"Read replica {replica.name} still unavailable: {e}")
+                else:
+                    replica.unhealthy_until = 0.0
+                    logger.info(f"Read replica {replica.name} restored")
+
+        except asyncio.CancelledError:
+            logger.info("Replica health task cancelled")
+            break
+        except Exception as e:
+            logger.error(f"Error in replica health task: {e}")
@@ -3,7 +3,7 @@ from datetime import datetime
 from app.database.database import Base
 
 
-from sqlalchemy import ForeignKey, Numeric, CheckConstraint
+from sqlalchemy import ForeignKey, Numeric, CheckConstraint, Index
 
 
 class User(Base):
@@ -49,18 +49,20 @@ class Screening(Base):
     id = Column(Integer, primary_key=True, index=True)
     movie_id = Column(Integer, ForeignKey("movies.id", ondelete="CASCADE"), nullable=False)
     show_datetime = Column(DateTime, nullable=False)
+    hall = Column(Integer, nullable=False, default=1, server_default="1")
     total_seats = Column(Integer, nullable=False, default=100)
     price = Column(Numeric(10, 2), nullable=False, default=10.00)
+    # Active reservations, maintained on book/cancel and repaired by reconciliation
+    seats_taken = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, default=datetime.utcnow)
 
     __table_args__ = (
         CheckConstraint("total_seats > 0", name="valid_seats"),
+        CheckConstraint("seats_taken >= 0", name="valid_seats_taken"),
+        CheckConstraint("hall > 0", name="valid_hall"),
     )
 
 
-from sqlalchemy import UniqueConstraint
-
-
 class Reservation(Base):
     """Reservation model."""
 
@@ -76,14 +78,61 @@ class Reservation(Base):
 
     __table_args__ = (
         CheckConstraint("status IN ('active', 'cancelled')", name="valid_status"),
-        UniqueConstraint("screening_id", "seat_number", "status", name="unique_active_seat"),
     )
 
 
-from sqlalchemy import Index
+class ScheduledJob(Base):
+    """Shared schedule and leader lease for one background job."""
+
+    __tablename__ = "scheduled_jobs"
+
+    name = Column(String(100), primary_key=True)
+    next_run_at = Column(DateTime, nullable=False)
+    # Worker currently running the job; the lease lapses at lease_expires_at
+    lease_owner = Column(String(255), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    consecutive_failures = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class JobRun(Base):
+    """History entry for one execution of a background job."""
+
+    __tablename__ = "job_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_name = Column(String(100), nullable=False)
+    owner = Column(String(255), nullable=False)
+    attempt = Column(Integer, nullable=False, default=1)
+    status = Column(String(20), nullable=False, default="running")
+    started_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+    error = Column(String, nullable=True)
+
+    __table_args__ = (
+        CheckConstraint("status IN ('running', 'succeeded', 'failed', 'cancelled')", name="valid_job_status"),
+    )
+
 
+# Only one active reservation per seat; cancelled rows may repeat freely.
+Index(
+    "unique_active_seat",
+    Reservation.screening_id,
+    Reservation.seat_number,
+    unique=True,
+    postgresql_where=Reservation.status == "active",
+    sqlite_where=Reservation.status == "active",
+)
+
+# A hall runs one screening per start time; lets the scheduler insert idempotently
+Index(
+    "unique_screening_slot",
+    Screening.hall,
+    Screening.show_datetime,
+    unique=True,
+)
 Index("idx_screenings_movie_datetime", Screening.movie_id, Screening.show_datetime)
 Index("idx_screenings_datetime", Screening.show_datetime)
 Index("idx_reservations_user", Reservation.user_id)
 Index("idx_reservations_screening", Reservation.screening_id)
 Index("idx_reservations_status", Reservation.screening_id, Reservation.status)
+Index("idx_job_runs_job_started", JobRun.job_name, JobRun.started_at)
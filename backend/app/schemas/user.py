@@ -1,5 +1,6 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from pydantic import BaseModel, EmailStr, Field
+from typing import List, Optional
+from decimal import Decimal
 from datetime import datetime
 
 
@@ -59,6 +60,23 @@ class MoviesResponse(MoviesAdd):
         from_attributes = True
 
 
+class UpcomingScreeningResponse(BaseModel):
+    """Upcoming screening embedded in a movie listing."""
+    
+    id: int
+    show_datetime: datetime
+    hall: int
+    total_seats: int
+    price: Decimal
+    seats_remaining: int
+
+
+class MovieWithScreeningsResponse(MoviesResponse):
+    """Movie with its upcoming screenings and remaining seat counts."""
+    
+    screenings: List[UpcomingScreeningResponse] = []
+
+
 from decimal import Decimal
 
 
@@ -67,7 +85,8 @@ class ScreeningAdd(BaseModel):
     
     movie_id: int
     show_datetime: datetime
-    total_seats: int = 100
+    hall: int = Field(default=1, ge=1)
+    total_seats: int = Field(default=100, ge=1)
     price: Decimal = Decimal("10.00")
 
 
@@ -75,6 +94,7 @@ class ScreeningResponse(ScreeningAdd):
     """Screening response schema."""
     
     id: int
+    seats_taken: int = 0
     created_at: Optional[datetime] = None
     
     class Config:
@@ -95,6 +115,30 @@ class SeatAvailabilityResponse(BaseModel):
     available_seats: List[str]
 
 
+class BestSeatsResponse(BaseModel):
+    """Best available adjacent seats for a screening."""
+    
+    screening_id: int
+    seat_numbers: List[str]
+
+
+# Seat Hold Schemas
+class SeatHoldCreate(BaseModel):
+    """Seat hold request schema."""
+    
+    screening_id: int
+    seat_number: str
+
+
+class SeatHoldResponse(BaseModel):
+    """Seat hold response schema."""
+    
+    hold_id: str
+    screening_id: int
+    seat_number: str
+    expires_at: datetime
+
+
 # Payment Schemas (Fake Payment Simulation)
 class PaymentRequest(BaseModel):
     """Fake payment request schema."""
@@ -133,6 +177,18 @@ class ReservationCreate(BaseModel):
     payment: PaymentRequest
 
 
+class GroupReservationCreate(BaseModel):
+    """
+    Multi-seat reservation creation schema with a single payment.
+    Give either explicit seat_numbers or a seat_count to book the best adjacent seats.
+    """
+    
+    screening_id: int
+    seat_numbers: Optional[List[str]] = Field(default=None, min_length=1)
+    seat_count: Optional[int] = Field(default=None, ge=1)
+    payment: PaymentRequest
+
+
 class ReservationResponse(BaseModel):
     """Reservation response schema."""
     
@@ -162,3 +218,46 @@ class ReservationListResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class ExpandedReservationResponse(ReservationListResponse):
+    """Reservation list item with optional inline screening and movie."""
+    
+    screening: Optional[ScreeningResponse] = None
+    movie: Optional[MoviesResponse] = None
+
+
+class GroupReservationResponse(BaseModel):
+    """Multi-seat reservation response schema."""
+    
+    reservations: List[ReservationListResponse]
+    payment_info: PaymentResponse
+
+
+class ScheduledJobResponse(BaseModel):
+    """Background job schedule and lease state."""
+    
+    name: str
+    next_run_at: datetime
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    consecutive_failures: int = 0
+    
+    class Config:
+        from_attributes = True
+
+
+class JobRunResponse(BaseModel):
+    """One recorded execution of a background job."""
+    
+    id: int
+    job_name: str
+    owner: str
+    attempt: int
+    status: str
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
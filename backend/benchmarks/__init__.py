@@ -0,0 +1,6 @@
+"""
+Load-test and benchmark suite for the booking hot paths.
+
+Run from the backend directory with `python -m benchmarks.run`; see
+benchmarks/run.py for options.
+"""
@@ -0,0 +1,119 @@
+"""
+Benchmark dataset.
+
+Builds a fresh schema and bulk-inserts a deterministic catalog: movies,
+screenings spread over the coming weeks, users sharing one password, and
+reservations filling the front rows of every screening. Row counts scale
+with a single factor so runs on different machines use the same shape.
+"""
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import insert, select, update
+
+from app.core.layout import layout_for_screening
+from app.core.security import create_access_token, get_password_hash
+from app.database.database import Base, SessionLocal, get_engine
+from app.models.user import Movie, Reservation, Screening, User
+
+BENCH_PASSWORD = "bench-password"
+SEATS_PER_SCREENING = 100
+# Share of each screening's seats that start out reserved
+OCCUPANCY = 0.3
+GENRES = ("Action", "Romance", "Sci-Fi", "Horror", "Comedy")
+
+
+@dataclass
+class Dataset:
+    """Ids and credentials the scenarios draw from."""
+
+    user_emails: list[str]
+    user_tokens: list[str]
+    screening_ids: list[int]
+    # (reservation id, owner's token) for ticket downloads
+    tickets: list[tuple[int, str]]
+    # Screening with no reservations, kept for contended booking
+    contended_screening_id: int
+
+
+def build_dataset(scale: int = 1, seed: int = 1234) -> Dataset:
+    """
+    Drop and recreate all tables, then fill them; `scale` multiplies every row count.
+    Destroys whatever the configured database holds, see --reset-database in run.py.
+    """
+    rng = random.Random(seed)
+    engine = get_engine()
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    user_count = 200 * scale
+    movie_count = 20 * scale
+    screening_count = 500 * scale
+    layout = layout_for_screening(SEATS_PER_SCREENING)
+    seats_reserved = int(layout.total_seats * OCCUPANCY)
+    now = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+
+    # One hash for everyone: realistic bcrypt cost at login, cheap to seed
+    password_hash = get_password_hash(BENCH_PASSWORD)
+    user_emails = [f"bench{i}@example.com" for i in range(user_count)]
+
+    with SessionLocal() as db:
+        db.execute(insert(User), [
+            {"email": email, "password_hash": password_hash, "role": "user"}
+            for email in user_emails
+        ])
+        db.execute(insert(Movie), [
+            {
+                "title": f"Benchmark Movie {i}",
+                "description": "Benchmark fixture",
+                "poster_url": None,
+                "genre": GENRES[i % len(GENRES)],
+            }
+            for i in range(movie_count)
+        ])
+        movie_ids = list(db.scalars(select(Movie.id).order_by(Movie.id)))
+        db.execute(insert(Screening), [
+            {
+                "movie_id": movie_ids[i % movie_count],
+                "show_datetime": now + timedelta(days=1 + i // 8, hours=10 + 2 * (i % 8)),
+                "total_seats": SEATS_PER_SCREENING,
+                "price": Decimal("12.50"),
+                "seats_taken": 0,
+            }
+            for i in range(screening_count + 1)
+        ])
+        screening_ids = list(db.scalars(select(Screening.id).order_by(Screening.id)))
+        contended_screening_id = screening_ids.pop()
+
+        user_ids = list(db.scalars(select(User.id).order_by(User.id)))
+        db.execute(insert(Reservation), [
+            {
+                "screening_id": screening_id,
+                "user_id": rng.choice(user_ids),
+                "seat_number": layout.label_of(index),
+                "status": "active",
+            }
+            for screening_id in screening_ids
+            for index in range(seats_reserved)
+        ])
+        db.execute(
+            update(Screening)
+            .where(Screening.id.in_(screening_ids))
+            .values(seats_taken=seats_reserved)
+        )
+        db.commit()
+
+        tokens = {user_id: create_access_token(data={"sub": str(user_id)}) for user_id in user_ids}
+        reservations = db.execute(select(Reservation.id, Reservation.user_id).order_by(Reservation.id)).all()
+
+    tickets = [(reservation_id, tokens[user_id]) for reservation_id, user_id in reservations]
+    rng.shuffle(tickets)
+    return Dataset(
+        user_emails=user_emails,
+        user_tokens=[tokens[user_id] for user_id in user_ids],
+        screening_ids=screening_ids,
+        tickets=tickets,
+        contended_screening_id=contended_screening_id,
+    )
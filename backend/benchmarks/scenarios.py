@@ -0,0 +1,132 @@
+"""
+Benchmark scenarios and the load driver.
+
+Each scenario turns a request index into one HTTP request against the app.
+The driver keeps `concurrency` requests in flight until `requests` have
+completed, recording the latency and status of each, and summarises them
+as throughput and latency percentiles.
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import httpx
+
+from benchmarks.dataset import BENCH_PASSWORD, Dataset
+
+PAYMENT = {"card_number": "4111111111111111", "expiry_month": 12, "expiry_year": 2030, "cvv": "123"}
+# Seats every contended booking request fights over
+CONTENDED_SEATS = ("E5", "E6", "E7", "E8")
+PERCENTILES = (50, 90, 95, 99)
+
+
+@dataclass(frozen=True)
+class RequestSpec:
+    method: str
+    url: str
+    kwargs: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    description: str
+    default_requests: int
+    # Statuses that count as success; anything else is an error
+    expected_statuses: frozenset[int]
+    build: Callable[[Dataset, int], RequestSpec]
+
+
+def _auth(token: str) -> dict[str, Any]:
+    return {"headers": {"Authorization": f"Bearer {token}"}}
+
+
+def login_storm(data: Dataset, i: int) -> RequestSpec:
+    email = data.user_emails[i % len(data.user_emails)]
+    return RequestSpec("POST", "/api/v1/users/login", {"data": {"username": email, "password": BENCH_PASSWORD}})
+
+
+def seat_reads(data: Dataset, i: int) -> RequestSpec:
+    screening_id = data.screening_ids[(i * 7919) % len(data.screening_ids)]
+    token = data.user_tokens[i % len(data.user_tokens)]
+    return RequestSpec("GET", f"/api/v1/screening/{screening_id}/seats", _auth(token))
+
+
+def contended_booking(data: Dataset, i: int) -> RequestSpec:
+    token = data.user_tokens[i % len(data.user_tokens)]
+    body = {
+        "screening_id": data.contended_screening_id,
+        "seat_number": CONTENDED_SEATS[i % len(CONTENDED_SEATS)],
+        "payment": PAYMENT,
+    }
+    return RequestSpec("POST", "/api/v1/reservation/", {"json": body, **_auth(token)})
+
+
+def ticket_downloads(data: Dataset, i: int) -> RequestSpec:
+    reservation_id, token = data.tickets[i % len(data.tickets)]
+    return RequestSpec("GET", f"/api/v1/reservation/{reservation_id}/ticket", _auth(token))
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("login_storm", "Concurrent logins (bcrypt on the worker pool)", 100,
+                 frozenset({200}), login_storm),
+        Scenario("seat_reads", "Seat availability across many screenings", 2000,
+                 frozenset({200}), seat_reads),
+        Scenario("contended_booking", f"Many users booking the same {len(CONTENDED_SEATS)} seats", 500,
+                 frozenset({201, 409}), contended_booking),
+        Scenario("ticket_downloads", "PDF ticket downloads for existing reservations", 500,
+                 frozenset({200}), ticket_downloads),
+    )
+}
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    data: Dataset,
+    requests: int,
+    concurrency: int,
+) -> dict[str, Any]:
+    """Drive one scenario and summarise its latencies and statuses."""
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    next_index = iter(range(requests))
+
+    async def worker():
+        for i in next_index:
+            spec = scenario.build(data, i)
+            start = time.perf_counter()
+            response = await client.request(spec.method, spec.url, **spec.kwargs)
+            await response.aread()
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    latency_ms = {f"p{pct}": round(percentile(latencies, pct) * 1000, 3) for pct in PERCENTILES}
+    latency_ms["mean"] = round(sum(latencies) / len(latencies) * 1000, 3)
+    latency_ms["max"] = round(latencies[-1] * 1000, 3)
+    return {
+        "description": scenario.description,
+        "requests": requests,
+        "concurrency": concurrency,
+        "duration_seconds": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 2),
+        "latency_ms": latency_ms,
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "errors": sum(count for code, count in statuses.items() if code not in scenario.expected_statuses),
+    }
@@ -5,46 +5,80 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
-from app.database.database import Base, engine
-from app.api.v1 import health, users, screening, reservation
-from app.core.seed import seed_initial_data, weekly_screening_task
-
-# Create database tables
-Base.metadata.create_all(bind=engine)
+from app.database.database import init_db
+from app.api.v1 import health, users, movies, screening, reservation, hold, jobs
+from app.core.seed import seed_initial_data, screening_schedule_job
+from app.core.holds import hold_sweeper_task
+from app.core.counters import seat_counter_reconcile_job
+from app.core.jobs import CronTrigger, IntervalTrigger, Job, job_scheduler, prune_job_runs
+from app.core.metrics import MetricsMiddleware
+from app.core.profiling import SQLProfilerMiddleware
+from app.database.replicas import ReadYourWritesMiddleware, replica_health_task, replica_router
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Background task reference
-background_task = None
+# Background task references
+background_tasks = []
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifespan events."""
-    global background_task
     
     # Startup
     logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
     
-    # Seed initial data (movies and screenings)
-    seed_initial_data()
+    # Schema and seed data are normally set up once with `python -m app.cli init-db --seed`;
+    # DB_AUTO_INIT does it on start-up for development setups. Seeding takes the
+    # scheduler's lease so only one of several workers runs it.
+    if settings.DB_AUTO_INIT:
+        await asyncio.to_thread(init_db)
+        seeded = await job_scheduler.run_exclusive(
+            "seed_initial_data", lambda: asyncio.to_thread(seed_initial_data)
+        )
+        if not seeded:
+            logger.info("Another worker is seeding initial data")
+    
+    # Shared maintenance jobs: every worker polls, one at a time runs each job
+    job_scheduler.add_job(Job(
+        "schedule_screenings",
+        screening_schedule_job,
+        CronTrigger(settings.SCREENING_SCHEDULE_CRON),
+        run_immediately=True,
+    ))
+    job_scheduler.add_job(Job(
+        "reconcile_seat_counters",
+        seat_counter_reconcile_job,
+        IntervalTrigger(settings.SEAT_COUNTER_RECONCILE_INTERVAL_SECONDS),
+        run_immediately=True,
+    ))
+    job_scheduler.add_job(Job("prune_job_runs", prune_job_runs, CronTrigger("30 4 * * *")))
+    background_tasks.append(asyncio.create_task(job_scheduler.run()))
+    logger.info(f"Started job scheduler as {job_scheduler.owner}")
+    
+    # Start background task reclaiming expired seat holds
+    background_tasks.append(asyncio.create_task(hold_sweeper_task()))
+    logger.info("Started seat hold sweeper")
     
-    # Start background task for weekly screening creation
-    background_task = asyncio.create_task(weekly_screening_task())
-    logger.info("Started weekly screening background task")
+    # Probe failed read replicas so they rejoin the rotation
+    if replica_router.database_urls:
+        background_tasks.append(asyncio.create_task(replica_health_task()))
+        logger.info(f"Routing reads to {len(replica_router.database_urls)} replicas")
     
     yield
     
     # Shutdown
     logger.info(f"Shutting down {settings.APP_NAME}")
-    if background_task:
-        background_task.cancel()
+    for task in background_tasks:
+        task.cancel()
         try:
-            await background_task
+            await task
         except asyncio.CancelledError:
             pass
+    background_tasks.clear()
+    await replica_router.dispose()
 
 
 # Initialize FastAPI app with lifespan
@@ -55,12 +89,19 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Keep clients on the primary right after they write (only matters with replicas)
+if replica_router.database_urls:
+    app.add_middleware(ReadYourWritesMiddleware)
+
 # CORS allowed origins
 ALLOWED_ORIGINS = [
     "https://movie-reservation-f2pv.vercel.app",
     "http://localhost:3000",  # Keep for local development
 ]
 
+# Opt-in SQL profiling (headers added inside CORS so they can be exposed)
+app.add_middleware(SQLProfilerMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -68,14 +109,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["Content-Disposition"],  # Needed for file downloads
+    expose_headers=[
+        "Content-Disposition", "ETag", "X-Next-Cursor",  # Needed for file downloads, caching and paging
+        "X-SQL-Query-Count", "X-SQL-Query-Time-Ms", "X-SQL-Repeated",  # SQL profiling
+    ],
 )
 
+# Outermost middleware, so request metrics cover everything below it
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(health.router)
 app.include_router(users.router, prefix="/api/v1")
+app.include_router(movies.router, prefix="/api/v1")
 app.include_router(screening.router, prefix="/api/v1")
 app.include_router(reservation.router, prefix="/api/v1")
+app.include_router(hold.router, prefix="/api/v1")
+app.include_router(jobs.router, prefix="/api/v1")
 
 @app.get("/")
 async def root():
@@ -0,0 +1,62 @@
+"""
+Shared fixtures: an isolated SQLite database with seeded movies and
+screenings, and an authenticated client holding a few reservations.
+"""
+import os
+import tempfile
+
+_db_dir = tempfile.mkdtemp(prefix="moviehub-tests-")
+# Settings are read at import time, so configure them before importing the app
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ["SECRET_KEY"] = "test-secret"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ.pop("READ_REPLICA_URLS", None)
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.cli import seed
+from app.database.database import init_db
+from main import app
+
+PAYMENT = {"card_number": "4111111111111111", "expiry_month": 12, "expiry_year": 2030, "cvv": "123"}
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Client without the lifespan, so no background jobs touch the database."""
+    init_db()
+    seed()
+    return TestClient(app)
+
+
+@pytest.fixture(scope="session")
+def payment():
+    """Card details the fake payment processor accepts."""
+    return PAYMENT
+
+
+@pytest.fixture(scope="session")
+def user_headers(client):
+    """Register a user by email and return their auth headers."""
+    def login(email: str) -> dict:
+        client.post("/api/v1/users/register", json={"email": email, "password": "password"})
+        response = client.post("/api/v1/users/login", data={"username": email, "password": "password"})
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return login
+
+
+@pytest.fixture(scope="session")
+def auth_headers(client, user_headers):
+    """Headers for a user holding reservations for several screenings."""
+    headers = user_headers("budget@example.com")
+
+    screenings = client.get("/api/v1/screening/?upcoming=true&limit=3", headers=headers).json()
+    for screening in screenings:
+        response = client.post(
+            "/api/v1/reservation/group",
+            json={"screening_id": screening["id"], "seat_count": 2, "payment": PAYMENT},
+            headers=headers,
+        )
+        assert response.status_code == 201, response.text
+    return headers
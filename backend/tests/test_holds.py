@@ -0,0 +1,118 @@
+"""
+Seat holds: a hold blocks other customers until it expires, extensions are
+capped at the maximum lifetime, and the sweeper reclaims expired holds and
+announces the freed seats.
+"""
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import holds
+from app.core.config import settings
+from app.core.events import seat_events
+from app.core.holds import InMemoryHoldBackend, SeatHoldStore, hold_sweeper_task
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Settable replacement for time.time() as seen by the holds module."""
+    now = SimpleNamespace(value=1_000_000.0)
+    monkeypatch.setattr(holds, "time", SimpleNamespace(time=lambda: now.value))
+    return now
+
+
+def make_store():
+    return SeatHoldStore(InMemoryHoldBackend(), ttl_seconds=60, max_lifetime_seconds=150, max_per_user=2)
+
+
+def test_hold_blocks_others_until_expiry(clock):
+    store = make_store()
+
+    async def scenario():
+        hold = await store.hold(1, "A1", user_id=1)
+        assert await store.hold(1, "A1", user_id=2) is None
+        assert await store.held_by_others(1, user_id=2) == {"A1"}
+
+        clock.value = hold.expires_at
+        assert await store.holder_of(1, "A1") is None
+        taken_over = await store.hold(1, "A1", user_id=2)
+        assert taken_over is not None and taken_over.user_id == 2
+
+    asyncio.run(scenario())
+
+
+def test_extend_is_capped_at_max_lifetime(clock):
+    store = make_store()
+
+    async def scenario():
+        hold = await store.hold(1, "A1", user_id=1)
+        clock.value += 50
+        extended = await store.extend(hold)
+        assert extended.expires_at == hold.created_at + 110
+        clock.value += 50
+        extended = await store.extend(extended)
+        assert extended.expires_at == hold.created_at + 150
+
+    asyncio.run(scenario())
+
+
+def test_sweep_reclaims_only_expired_holds(clock):
+    store = make_store()
+
+    async def scenario():
+        expiring = await store.hold(1, "A1", user_id=1)
+        extended = await store.hold(1, "A2", user_id=1)
+        clock.value += 50
+        await store.extend(extended)
+
+        # Past the original expiry of both holds, but not the extension
+        clock.value += 20
+        expired = await store.sweep()
+        assert [hold.seat_number for hold in expired] == ["A1"]
+        assert await store.backend.get(expiring.hold_id) is None
+        assert await store.get(extended.hold_id) is not None
+        assert await store.count_for_user(1) == 1
+
+    asyncio.run(scenario())
+
+
+def test_sweeper_task_announces_reclaimed_seats(clock, monkeypatch):
+    store = make_store()
+    monkeypatch.setattr(holds, "seat_holds", store)
+    monkeypatch.setattr(settings, "SEAT_HOLD_SWEEP_INTERVAL_SECONDS", 0.01)
+
+    async def scenario():
+        queue = seat_events.subscribe(1)
+        try:
+            await store.hold(1, "A1", user_id=1)
+            clock.value += 60
+            sweeper = asyncio.create_task(hold_sweeper_task())
+            message = await asyncio.wait_for(queue.get(), timeout=5)
+            sweeper.cancel()
+            await sweeper
+        finally:
+            seat_events.unsubscribe(1, queue)
+        return message
+
+    message = asyncio.run(scenario())
+    payload = json.loads(message.decode().split("data: ", 1)[1])
+    assert payload["available"] == ["A1"]
+    assert asyncio.run(store.backend.get_for_seat(1, "A1")) is None
+
+
+def test_held_seat_cannot_be_booked_until_hold_expires(client, user_headers, payment, clock):
+    alice, bob = user_headers("alice@example.com"), user_headers("bob@example.com")
+    screening_id = client.get("/api/v1/screening/?upcoming=true", headers=alice).json()[-2]["id"]
+
+    hold = client.post("/api/v1/hold/", json={"screening_id": screening_id, "seat_number": "D1"}, headers=alice)
+    assert hold.status_code == 201
+    booking = {"screening_id": screening_id, "seat_number": "D1", "payment": payment}
+    response = client.post("/api/v1/reservation/", json=booking, headers=bob)
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Seat D1 is currently held by another customer"
+
+    clock.value += settings.SEAT_HOLD_TTL_SECONDS
+    response = client.post("/api/v1/reservation/", json=booking, headers=bob)
+    assert response.status_code == 201, response.text
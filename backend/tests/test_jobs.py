@@ -0,0 +1,224 @@
+"""
+Background jobs: cron parsing and next-fire times, and the scheduled_jobs
+lease that keeps each run on a single worker (claim, renew, release, and
+cancelling work whose lease cannot be kept).
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.exc import OperationalError
+
+from app.core import jobs
+from app.core.config import settings
+from app.core.jobs import CronTrigger, IntervalTrigger, Job, JobScheduler, LeaseLost
+from app.database.database import AsyncSessionLocal
+from app.models.user import JobRun, ScheduledJob
+
+# A Thursday, half a minute before the new year
+MOMENT = datetime(2026, 12, 31, 23, 59, 30)
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("0 3 * * *", datetime(2027, 1, 1, 3, 0)),
+    ("*/15 * * * *", datetime(2027, 1, 1, 0, 0)),
+    ("30 8 * 6 *", datetime(2027, 6, 1, 8, 30)),
+    ("0 0 29 2 *", datetime(2028, 2, 29, 0, 0)),
+    ("0 9 * * 1-5", datetime(2027, 1, 1, 9, 0)),
+    ("@weekly", datetime(2027, 1, 3, 0, 0)),
+    # 7 is Sunday too
+    ("0 0 * * 7", datetime(2027, 1, 3, 0, 0)),
+    # Day of month and day of week both restricted: either matches
+    ("0 12 13 * 5", datetime(2027, 1, 1, 12, 0)),
+])
+def test_cron_next_fire_time(expression, expected):
+    assert CronTrigger(expression).next_after(MOMENT) == expected
+
+
+@pytest.mark.parametrize("expression", ["* * *", "61 * * * *", "*/0 * * * *", "5-1 * * * *", "0 0 * 13 *", "x * * * *"])
+def test_cron_rejects_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        CronTrigger(expression)
+
+
+def test_cron_that_never_fires():
+    with pytest.raises(ValueError, match="never matches"):
+        CronTrigger("0 0 31 2 *").next_after(MOMENT)
+
+
+@pytest.fixture
+def short_lease(client, monkeypatch):
+    """A lease short enough for renewals to happen within a test (tables come from the client fixture)."""
+    monkeypatch.setattr(settings, "JOB_LEASE_SECONDS", 0.3)
+    monkeypatch.setattr(jobs, "LEASE_RETRY_BASE_SECONDS", 0.02)
+
+
+async def load_schedule(name):
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(ScheduledJob).where(ScheduledJob.name == name))
+
+
+async def load_runs(name):
+    async with AsyncSessionLocal() as db:
+        return (await db.scalars(select(JobRun).where(JobRun.job_name == name).order_by(JobRun.id))).all()
+
+
+async def set_schedule(name, **values):
+    async with AsyncSessionLocal() as db:
+        await db.execute(update(ScheduledJob).where(ScheduledJob.name == name).values(**values))
+        await db.commit()
+
+
+def make_schedulers(job, count=2):
+    schedulers = [JobScheduler() for _ in range(count)]
+    for scheduler in schedulers:
+        scheduler.add_job(job)
+    return schedulers
+
+
+def test_claim_is_exclusive_until_released(short_lease):
+    async def noop():
+        pass
+
+    job = Job("test-claim", noop, IntervalTrigger(60), run_immediately=True)
+    first, second = make_schedulers(job)
+
+    async def scenario():
+        await first._register()
+        assert await first._claim(job) == 0
+        assert await second._claim(job) is None
+
+        await first._execute(job, 0)
+        schedule = await load_schedule(job.name)
+        assert schedule.lease_owner is None and schedule.lease_expires_at is None
+        assert schedule.next_run_at > datetime.utcnow() + timedelta(seconds=50)
+        # Released, but not due again yet
+        assert await second._claim(job) is None
+
+        await set_schedule(job.name, next_run_at=datetime.utcnow())
+        assert await second._claim(job) == 0
+        assert (await load_schedule(job.name)).lease_owner == second.owner
+
+    asyncio.run(scenario())
+
+
+def test_expired_lease_can_be_claimed(short_lease):
+    async def noop():
+        pass
+
+    job = Job("test-expired", noop, IntervalTrigger(60), run_immediately=True)
+    first, second = make_schedulers(job)
+
+    async def scenario():
+        await first._register()
+        assert await first._claim(job) == 0
+        # The first worker died without releasing its lease
+        await set_schedule(job.name, lease_expires_at=datetime.utcnow() - timedelta(seconds=1))
+        assert await second._claim(job) == 0
+
+    asyncio.run(scenario())
+
+
+def test_lease_is_renewed_while_the_job_runs(short_lease):
+    async def slow():
+        await asyncio.sleep(0.6)
+
+    job = Job("test-renew", slow, IntervalTrigger(60), run_immediately=True)
+    first, second = make_schedulers(job)
+
+    async def scenario():
+        await first._register()
+        assert await first._claim(job) == 0
+        running = asyncio.create_task(first._execute(job, 0))
+        # Well past the original expiry
+        await asyncio.sleep(0.45)
+        assert await second._claim(job) is None
+        await running
+        return await load_runs(job.name)
+
+    runs = asyncio.run(scenario())
+    assert [run.status for run in runs] == ["succeeded"]
+
+
+def test_job_is_cancelled_when_its_lease_is_taken(short_lease):
+    async def stuck():
+        await asyncio.sleep(30)
+
+    job = Job("test-stolen", stuck, IntervalTrigger(60), run_immediately=True)
+    (scheduler,) = make_schedulers(job, count=1)
+
+    async def scenario():
+        await scheduler._register()
+        assert await scheduler._claim(job) == 0
+        running = asyncio.create_task(scheduler._execute(job, 0))
+        await asyncio.sleep(0.05)
+        await set_schedule(job.name, lease_owner="another-worker")
+        await asyncio.wait_for(running, timeout=5)
+        return await load_runs(job.name), await load_schedule(job.name)
+
+    runs, schedule = asyncio.run(scenario())
+    assert [(run.status, run.error) for run in runs] == [("cancelled", "Lost the lease on job test-stolen")]
+    # The release only touches a lease this worker still owns
+    assert schedule.lease_owner == "another-worker"
+
+
+class FlakySessions:
+    """Session factory that fails to connect while `down` is set."""
+
+    def __init__(self):
+        self.down = False
+
+    def __call__(self):
+        if self.down:
+            raise OperationalError("UPDATE scheduled_jobs", {}, ConnectionError("database unavailable"))
+        return AsyncSessionLocal()
+
+
+def test_renewal_retries_through_a_brief_outage(short_lease):
+    sessions = FlakySessions()
+    scheduler = JobScheduler(sessionmaker=sessions)
+    finished = []
+
+    async def work():
+        await asyncio.sleep(0.12)
+        sessions.down = True
+        await asyncio.sleep(0.1)
+        sessions.down = False
+        await asyncio.sleep(0.3)
+        finished.append(True)
+
+    scheduler.add_job(Job("test-blip", work, IntervalTrigger(60), run_immediately=True))
+
+    async def scenario():
+        await scheduler._register()
+        assert await scheduler._claim(scheduler.jobs["test-blip"]) == 0
+        await scheduler._run_leased("test-blip", work)
+
+    asyncio.run(scenario())
+    assert finished == [True]
+
+
+def test_job_is_cancelled_when_the_lease_cannot_be_renewed(short_lease):
+    sessions = FlakySessions()
+    scheduler = JobScheduler(sessionmaker=sessions)
+    cancelled = []
+
+    async def work():
+        sessions.down = True
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    scheduler.add_job(Job("test-outage", work, IntervalTrigger(60), run_immediately=True))
+
+    async def scenario():
+        await scheduler._register()
+        assert await scheduler._claim(scheduler.jobs["test-outage"]) == 0
+        with pytest.raises(LeaseLost):
+            await asyncio.wait_for(scheduler._run_leased("test-outage", work), timeout=5)
+
+    asyncio.run(scenario())
+    assert cancelled == [True]
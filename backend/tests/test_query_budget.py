@@ -0,0 +1,53 @@
+"""
+Query budgets for the hot read endpoints.
+
+Each budget is the number of statements the endpoint runs with a cold
+cache. It does not depend on how many rows come back, so an N+1 (one query
+per movie, screening or reservation) breaks the test instead of slipping
+through as a slow endpoint.
+"""
+import pytest
+
+from app.core.cache import MOVIES, SCREENINGS, catalog_cache
+from app.core.profiling import max_queries
+from app.core.tickets import ticket_cache
+
+
+@pytest.fixture(autouse=True)
+def cold_caches(client, auth_headers):
+    """Start every test with empty response caches and a verified token."""
+    catalog_cache.invalidate(MOVIES, SCREENINGS)
+    # Token verification is cached per process; warm it so budgets count the endpoint only
+    client.get("/api/v1/users/me", headers=auth_headers)
+
+
+def test_movies_list(client):
+    # Movies, then their upcoming screenings in one batch
+    with max_queries(2):
+        response = client.get("/api/v1/movies/")
+    assert response.status_code == 200
+    assert len(response.json()) > 1
+
+
+def test_screenings_list(client, auth_headers):
+    with max_queries(1):
+        response = client.get("/api/v1/screening/?limit=50", headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.json()) > 1
+
+
+def test_my_reservations_expanded(client, auth_headers):
+    # Reservations joined to their screenings and movies
+    with max_queries(1):
+        response = client.get("/api/v1/reservation/?expand=screening,movie", headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 6
+
+
+def test_ticket_download(client, auth_headers):
+    reservation_id = client.get("/api/v1/reservation/", headers=auth_headers).json()[0]["id"]
+    ticket_cache.invalidate(reservation_id)
+    with max_queries(1):
+        response = client.get(f"/api/v1/reservation/{reservation_id}/ticket", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
@@ -0,0 +1,135 @@
+"""
+Seat booking: one active reservation per seat, whichever check catches a
+double booking, seats freed by a cancellation can be booked again, and
+automatically allocated group bookings move to other seats when they lose
+a race.
+"""
+import pytest
+
+from app.api.v1 import reservation as reservation_api
+from app.core.config import settings
+from app.core.metrics import bookings_total
+from app.database.database import SessionLocal
+from app.models.user import Reservation
+
+
+@pytest.fixture(scope="module")
+def screening_ids(client, user_headers):
+    """Upcoming screenings, latest first, away from the ones auth_headers books."""
+    headers = user_headers("booking-list@example.com")
+    screenings = client.get("/api/v1/screening/?upcoming=true", headers=headers).json()
+    return [screening["id"] for screening in reversed(screenings)]
+
+
+@pytest.fixture
+def book(client, payment):
+    """Book one seat as the given user."""
+    def post(headers, screening_id, seat_number):
+        return client.post(
+            "/api/v1/reservation/",
+            json={"screening_id": screening_id, "seat_number": seat_number, "payment": payment},
+            headers=headers,
+        )
+    return post
+
+
+def insert_reservation(client, headers, screening_id, seat_number):
+    """Book a seat straight in the database, as another worker would, behind the seat map's back."""
+    user_id = client.get("/api/v1/users/me", headers=headers).json()["id"]
+    with SessionLocal() as db:
+        db.add(Reservation(screening_id=screening_id, user_id=user_id, seat_number=seat_number, status="active"))
+        db.commit()
+
+
+def lost_races():
+    return bookings_total._values.get(("lost_race",), 0)
+
+
+def active_reservations(screening_id, seat_number):
+    with SessionLocal() as db:
+        return db.query(Reservation).filter_by(
+            screening_id=screening_id, seat_number=seat_number, status="active"
+        ).count()
+
+
+def test_double_booking_conflicts(client, user_headers, screening_ids, book):
+    alice, bob = user_headers("alice@example.com"), user_headers("bob@example.com")
+    screening_id = screening_ids[0]
+
+    assert book(alice, screening_id, "A1").status_code == 201
+    response = book(bob, screening_id, "A1")
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Seat A1 is already reserved"
+    assert active_reservations(screening_id, "A1") == 1
+
+
+def test_double_booking_rejected_by_unique_index(client, user_headers, screening_ids, book):
+    alice, bob = user_headers("alice@example.com"), user_headers("bob@example.com")
+    screening_id = screening_ids[0]
+    # Load the seat map first so only the insert itself can detect the clash
+    client.get(f"/api/v1/screening/{screening_id}/seats", headers=alice)
+    insert_reservation(client, bob, screening_id, "B1")
+    races = lost_races()
+
+    response = book(alice, screening_id, "B1")
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Seat B1 is already reserved"
+    assert lost_races() == races + 1
+    assert active_reservations(screening_id, "B1") == 1
+
+
+def test_rebook_after_cancel(client, user_headers, screening_ids, book):
+    alice, bob = user_headers("alice@example.com"), user_headers("bob@example.com")
+    screening_id = screening_ids[0]
+
+    # Two cancelled rows for the same seat must not block a third booking
+    for headers in (alice, bob):
+        response = book(headers, screening_id, "C1")
+        assert response.status_code == 201, response.text
+        cancel = client.post(f"/api/v1/reservation/{response.json()['id']}/cancel", headers=headers)
+        assert cancel.status_code == 200
+
+    assert book(alice, screening_id, "C1").status_code == 201
+    assert active_reservations(screening_id, "C1") == 1
+
+
+def test_group_booking_reallocates_after_lost_race(client, user_headers, screening_ids, payment):
+    alice, bob = user_headers("alice@example.com"), user_headers("bob@example.com")
+    screening_id = screening_ids[2]
+    # Loads the seat map; another worker then takes the middle of the best run
+    best = client.get(f"/api/v1/screening/{screening_id}/seats/best?count=3", headers=alice).json()["seat_numbers"]
+    insert_reservation(client, bob, screening_id, best[1])
+
+    response = client.post(
+        "/api/v1/reservation/group",
+        json={"screening_id": screening_id, "seat_count": 3, "payment": payment},
+        headers=alice,
+    )
+    assert response.status_code == 201, response.text
+    seats = [reservation["seat_number"] for reservation in response.json()["reservations"]]
+    assert best[1] not in seats
+    assert len({seat.rstrip("0123456789") for seat in seats}) == 1
+    numbers = sorted(int(seat.lstrip("ABCDEFGHIJKLMNOPQRSTUVWXYZ")) for seat in seats)
+    assert numbers == list(range(numbers[0], numbers[0] + 3))
+
+
+def test_group_booking_gives_up_after_repeated_lost_races(client, user_headers, screening_ids, payment, monkeypatch):
+    alice = user_headers("alice@example.com")
+    attempts = []
+
+    async def always_lose(db, screening_id, seat_numbers, user_id):
+        attempts.append(seat_numbers)
+        return [], seat_numbers
+
+    monkeypatch.setattr(reservation_api, "claim_seats", always_lose)
+    response = client.post(
+        "/api/v1/reservation/group",
+        json={"screening_id": screening_ids[3], "seat_count": 2, "payment": payment},
+        headers=alice,
+    )
+    assert response.status_code == 409
+    assert "due to concurrent bookings" in response.json()["detail"]
+    assert len(attempts) == settings.GROUP_BOOKING_ALLOCATION_ATTEMPTS
+    # Every retry avoids the seats lost so far
+    tried = [seat for seats in attempts for seat in seats]
+    assert len(tried) == len(set(tried))
@@ -3,16 +3,16 @@
 import { useEffect, useState } from 'react';
 import { useRouter } from 'next/navigation';
 import Link from 'next/link';
-import { reservationsApi, screeningsApi } from '@/lib/api';
+import { reservationsApi } from '@/lib/api';
 import { isAuthenticated } from '@/lib/auth';
-import type { Reservation, Screening } from '@/lib/types';
+import type { Reservation } from '@/lib/types';
 
 export default function ReservationsPage() {
     const router = useRouter();
     const [reservations, setReservations] = useState<Reservation[]>([]);
-    const [screenings, setScreenings] = useState<{ [key: number]: Screening }>({});
     const [loading, setLoading] = useState(true);
     const [actionLoading, setActionLoading] = useState<number | null>(null);
+    const [exporting, setExporting] = useState(false);
     const [error, setError] = useState('');
 
     useEffect(() => {
@@ -26,25 +26,9 @@ export default function ReservationsPage() {
 
     const loadReservations = async () => {
         try {
-            const data = await reservationsApi.getMyReservations();
+            // Screening and movie details come back inline in the same request
+            const data = await reservationsApi.getMyReservations(['screening', 'movie']);
             setReservations(data);
-
-            // Load screening details for each reservation
-            const screeningIds = [...new Set(data.map(r => r.screening_id))];
-            const screeningData: { [key: number]: Screening } = {};
-
-            await Promise.all(
-                screeningIds.map(async (id) => {
-                    try {
-                        const screening = await screeningsApi.getById(id);
-                        screeningData[id] = screening;
-                    } catch {
-                        // Screening might be deleted
-                    }
-                })
-            );
-
-            setScreenings(screeningData);
         } catch (err) {
             setError(err instanceof Error ? err.message : 'Failed to load reservations');
         } finally {
@@ -78,6 +62,17 @@ export default function ReservationsPage() {
         }
     };
 
+    const handleExportTickets = async () => {
+        setExporting(true);
+        try {
+            await reservationsApi.exportTickets('zip');
+        } catch (err) {
+            setError(err instanceof Error ? err.message : 'Failed to export tickets');
+        } finally {
+            setExporting(false);
+        }
+    };
+
     const formatDate = (dateString: string) => {
         const date = new Date(dateString);
         return {
@@ -97,7 +92,14 @@ export default function ReservationsPage() {
 
     return (
         <div className="container animate-fade-in" style={{ padding: '40px 20px' }}>
-            <h1 className="page-title">🎟️ My Tickets</h1>
+            <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center', flexWrap: 'wrap', gap: '16px' }}>
+                <h1 className="page-title">🎟️ My Tickets</h1>
+                {reservations.some(r => r.status === 'active') && (
+                    <button onClick={handleExportTickets} disabled={exporting} className="btn-secondary">
+                        {exporting ? 'Preparing...' : '📦 Download All Tickets'}
+                    </button>
+                )}
+            </div>
 
             {error && (
                 <div className="alert alert-error">{error}</div>
@@ -117,7 +119,7 @@ export default function ReservationsPage() {
             ) : (
                 <div style={{ display: 'flex', flexDirection: 'column', gap: '16px' }}>
                     {reservations.map((reservation) => {
-                        const screening = screenings[reservation.screening_id];
+                        const screening = reservation.screening;
                         const showtime = screening ? formatDate(screening.show_datetime) : null;
                         const isActive = reservation.status === 'active';
 
@@ -135,7 +137,7 @@ export default function ReservationsPage() {
                                         </div>
 
                                         <h3 style={{ fontSize: '1.25rem', fontWeight: 600, marginBottom: '8px' }}>
-                                            🎬 Movie #{reservation.screening_id} - Screening
+                                            🎬 {reservation.movie?.title ?? `Screening #${reservation.screening_id}`}
                                         </h3>
 
                                         <div style={{ display: 'flex', gap: '20px', flexWrap: 'wrap', color: 'rgba(229, 229, 229, 0.7)', fontSize: '14px' }}>
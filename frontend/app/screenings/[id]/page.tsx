@@ -1,13 +1,13 @@
 'use client';
 
-import { useEffect, useState, use } from 'react';
+import { useEffect, useRef, useState, use } from 'react';
 import { useRouter } from 'next/navigation';
 import Link from 'next/link';
-import { screeningsApi, reservationsApi } from '@/lib/api';
+import { screeningsApi, reservationsApi, holdsApi } from '@/lib/api';
 import { isAuthenticated } from '@/lib/auth';
 import SeatSelector from '@/components/SeatSelector';
 import PaymentForm from '@/components/PaymentForm';
-import type { Screening, SeatAvailability, PaymentRequest } from '@/lib/types';
+import type { Screening, SeatAvailability, SeatDelta, PaymentRequest, SeatHold } from '@/lib/types';
 
 export default function ScreeningDetailPage({ params }: { params: Promise<{ id: string }> }) {
     const resolvedParams = use(params);
@@ -15,6 +15,8 @@ export default function ScreeningDetailPage({ params }: { params: Promise<{ id:
     const [screening, setScreening] = useState<Screening | null>(null);
     const [seatData, setSeatData] = useState<SeatAvailability | null>(null);
     const [selectedSeat, setSelectedSeat] = useState<string | null>(null);
+    const [hold, setHold] = useState<SeatHold | null>(null);
+    const heldSeatRef = useRef<string | null>(null);
     const [loading, setLoading] = useState(true);
     const [bookingLoading, setBookingLoading] = useState(false);
     const [error, setError] = useState('');
@@ -29,6 +31,54 @@ export default function ScreeningDetailPage({ params }: { params: Promise<{ id:
         loadScreeningData();
     }, [resolvedParams.id, router]);
 
+    // Keep seat availability live from the server-sent event stream
+    useEffect(() => {
+        if (!isAuthenticated()) return;
+
+        const controller = new AbortController();
+        const screeningId = parseInt(resolvedParams.id);
+
+        const connect = async () => {
+            while (!controller.signal.aborted) {
+                try {
+                    await screeningsApi.streamSeatAvailability(screeningId, (event, data) => {
+                        if (event === 'snapshot') setSeatData(data as SeatAvailability);
+                        else if (event === 'seats') applySeatDelta(data as SeatDelta);
+                    }, controller.signal);
+                } catch {
+                    if (controller.signal.aborted) return;
+                }
+                // Stream ended or asked for a resync: reconnect for a fresh snapshot
+                await new Promise(resolve => setTimeout(resolve, 2000));
+            }
+        };
+        connect();
+
+        return () => controller.abort();
+    }, [resolvedParams.id]);
+
+    const applySeatDelta = (delta: SeatDelta) => {
+        setSeatData(prev => {
+            if (!prev) return prev;
+
+            const taken = new Set(prev.taken_seats);
+            // Our own hold shows up as taken for everyone else, not for us
+            delta.taken.filter(seat => seat !== heldSeatRef.current).forEach(seat => taken.add(seat));
+            delta.available.forEach(seat => taken.delete(seat));
+
+            const allSeats = prev.available_seats.concat(prev.taken_seats);
+            const takenSeats = allSeats.filter(seat => taken.has(seat));
+            const availableSeats = allSeats.filter(seat => !taken.has(seat));
+            return {
+                ...prev,
+                taken_seats: takenSeats,
+                available_seats: availableSeats,
+                taken_count: takenSeats.length,
+                available_count: availableSeats.length,
+            };
+        });
+    };
+
     const loadScreeningData = async () => {
         try {
             const screeningId = parseInt(resolvedParams.id);
@@ -45,6 +95,40 @@ export default function ScreeningDetailPage({ params }: { params: Promise<{ id:
         }
     };
 
+    // Hold the seat as soon as it is picked so conflicts surface before payment
+    const handleSelectSeat = async (seat: string) => {
+        if (!screening) return;
+
+        setError('');
+        try {
+            if (hold) {
+                await holdsApi.release(hold.hold_id).catch(() => undefined);
+                setHold(null);
+            }
+            heldSeatRef.current = seat;
+            const newHold = await holdsApi.create({ screening_id: screening.id, seat_number: seat });
+            setHold(newHold);
+            setSelectedSeat(seat);
+        } catch (err) {
+            heldSeatRef.current = null;
+            setSelectedSeat(null);
+            setError(err instanceof Error ? err.message : 'Seat is no longer available');
+            loadScreeningData();
+        }
+    };
+
+    const handlePickBestSeat = async () => {
+        if (!screening) return;
+
+        setError('');
+        try {
+            const best = await screeningsApi.getBestSeats(screening.id);
+            await handleSelectSeat(best.seat_numbers[0]);
+        } catch (err) {
+            setError(err instanceof Error ? err.message : 'No seats available');
+        }
+    };
+
     const handleBooking = async (payment: PaymentRequest) => {
         if (!selectedSeat || !screening) return;
 
@@ -162,13 +246,18 @@ export default function ScreeningDetailPage({ params }: { params: Promise<{ id:
 
                 {/* Seat Selection */}
                 <div className="glass-card">
-                    <h2 style={{ fontSize: '1.5rem', fontWeight: 600, marginBottom: '24px' }}>
-                        🪑 Select Your Seat
-                    </h2>
+                    <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center', marginBottom: '24px', gap: '16px', flexWrap: 'wrap' }}>
+                        <h2 style={{ fontSize: '1.5rem', fontWeight: 600 }}>
+                            🪑 Select Your Seat
+                        </h2>
+                        <button onClick={handlePickBestSeat} className="btn-secondary">
+                            ✨ Best Available
+                        </button>
+                    </div>
                     <SeatSelector
                         seatData={seatData}
                         selectedSeat={selectedSeat}
-                        onSelectSeat={setSelectedSeat}
+                        onSelectSeat={handleSelectSeat}
                     />
                 </div>
 
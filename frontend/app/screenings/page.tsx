@@ -24,7 +24,7 @@ export default function ScreeningsPage() {
 
     const loadScreenings = async () => {
         try {
-            const data = await screeningsApi.getAll();
+            const data = await screeningsApi.getAll({ upcoming: true });
             setScreenings(data);
         } catch (err) {
             setError(err instanceof Error ? err.message : 'Failed to load screenings');
@@ -138,7 +138,7 @@ export default function ScreeningsPage() {
                                         justifyContent: 'space-between',
                                     }}>
                                         <span style={{ color: 'rgba(229, 229, 229, 0.6)', fontSize: '14px' }}>
-                                            🪑 {screening.total_seats} seats
+                                            🪑 {screening.total_seats - (screening.seats_taken ?? 0)} of {screening.total_seats} seats left
                                         </span>
                                         <span style={{ color: '#7c3aed', fontWeight: 600, fontSize: '14px' }}>
                                             Book Now →
@@ -11,15 +11,22 @@ interface SeatSelectorProps {
 export default function SeatSelector({ seatData, selectedSeat, onSelectSeat }: SeatSelectorProps) {
     const seatsPerRow = 10;
 
+    // Split a label like "AB12" into its row ("AB") and seat number (12)
+    const parseSeat = (seat: string) => {
+        const match = /^([A-Z]+)(\d+)$/.exec(seat);
+        return match ? { row: match[1], num: parseInt(match[2]) } : { row: seat, num: 0 };
+    };
+
     // Group seats by row
     const seatsByRow: { [key: string]: string[] } = {};
-    seatData.available_seats.concat(seatData.taken_seats).sort().forEach(seat => {
-        const row = seat.charAt(0);
+    seatData.available_seats.concat(seatData.taken_seats).forEach(seat => {
+        const { row } = parseSeat(seat);
         if (!seatsByRow[row]) seatsByRow[row] = [];
         seatsByRow[row].push(seat);
     });
 
-    const rows = Object.keys(seatsByRow).sort();
+    // Order rows A..Z, then AA, AB, ...
+    const rows = Object.keys(seatsByRow).sort((a, b) => a.length - b.length || a.localeCompare(b));
 
     return (
         <div>
@@ -62,11 +69,7 @@ export default function SeatSelector({ seatData, selectedSeat, onSelectSeat }: S
                         </span>
 
                         {/* Seats */}
-                        {seatsByRow[row].sort((a, b) => {
-                            const numA = parseInt(a.slice(1));
-                            const numB = parseInt(b.slice(1));
-                            return numA - numB;
-                        }).map(seat => {
+                        {seatsByRow[row].sort((a, b) => parseSeat(a).num - parseSeat(b).num).map(seat => {
                             const isTaken = seatData.taken_seats.includes(seat);
                             const isSelected = selectedSeat === seat;
 
@@ -80,7 +83,7 @@ export default function SeatSelector({ seatData, selectedSeat, onSelectSeat }: S
                                         }`}
                                     title={isTaken ? 'Taken' : seat}
                                 >
-                                    {seat.slice(1)}
+                                    {parseSeat(seat).num}
                                 </button>
                             );
                         })}
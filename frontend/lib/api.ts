@@ -7,9 +7,15 @@ import type {
     AuthResponse,
     Screening,
     ScreeningCreate,
+    ScreeningFilters,
     SeatAvailability,
+    BestSeats,
     ReservationCreate,
     Reservation,
+    GroupReservationCreate,
+    GroupReservation,
+    SeatHoldCreate,
+    SeatHold,
     Movie
 } from './types';
 
@@ -19,7 +25,7 @@ interface FetchOptions extends RequestInit {
     skipAuth?: boolean;
 }
 
-async function fetchApi<T>(endpoint: string, options: FetchOptions = {}): Promise<T> {
+async function fetchResponse(endpoint: string, options: FetchOptions = {}): Promise<Response> {
     const { skipAuth = false, ...fetchOptions } = options;
 
     const headers: HeadersInit = {
@@ -38,6 +44,8 @@ async function fetchApi<T>(endpoint: string, options: FetchOptions = {}): Promis
     const response = await fetch(`${API_BASE_URL}${endpoint}`, {
         ...fetchOptions,
         headers,
+        // Sends the read-your-writes cookie that keeps reads on the primary after a write
+        credentials: 'include',
     });
 
     if (!response.ok) {
@@ -52,6 +60,12 @@ async function fetchApi<T>(endpoint: string, options: FetchOptions = {}): Promis
         throw new Error(error.detail || 'An error occurred');
     }
 
+    return response;
+}
+
+async function fetchApi<T>(endpoint: string, options: FetchOptions = {}): Promise<T> {
+    const response = await fetchResponse(endpoint, options);
+
     // Handle 204 No Content
     if (response.status === 204) {
         return {} as T;
@@ -60,6 +74,35 @@ async function fetchApi<T>(endpoint: string, options: FetchOptions = {}): Promis
     return response.json();
 }
 
+// Trigger a browser download for a blob
+function saveFile(blob: Blob, filename: string) {
+    const url = window.URL.createObjectURL(blob);
+    const a = document.createElement('a');
+    a.href = url;
+    a.download = filename;
+    a.style.display = 'none';
+    document.body.appendChild(a);
+    a.click();
+
+    // Cleanup after a short delay
+    setTimeout(() => {
+        window.URL.revokeObjectURL(url);
+        document.body.removeChild(a);
+    }, 100);
+}
+
+// Build a query string, skipping empty values
+function toQuery(params: Record<string, string | number | boolean | undefined>) {
+    const query = new URLSearchParams();
+    for (const [key, value] of Object.entries(params)) {
+        if (value !== undefined && value !== '') {
+            query.append(key, String(value));
+        }
+    }
+    const text = query.toString();
+    return text ? `?${text}` : '';
+}
+
 // Auth API
 export const authApi = {
     register: (data: UserCreate) =>
@@ -96,17 +139,86 @@ export const authApi = {
 // Movies API
 export const moviesApi = {
     getAll: () => fetchApi<Movie[]>('/api/v1/movies/', { skipAuth: true }),
+
+    // Resolve many movies in one request
+    getByIds: (ids: number[]) =>
+        fetchApi<Movie[]>(`/api/v1/movies/${toQuery({ ids: ids.join(',') })}`, { skipAuth: true }),
 };
 
 // Screenings API
 export const screeningsApi = {
-    getAll: () => fetchApi<Screening[]>('/api/v1/screening/'),
+    // Fetch one page; nextCursor is null on the last page
+    getPage: async (filters: ScreeningFilters = {}, cursor?: string) => {
+        const response = await fetchResponse(`/api/v1/screening/${toQuery({ ...filters, cursor })}`);
+        return {
+            items: await response.json() as Screening[],
+            nextCursor: response.headers.get('X-Next-Cursor'),
+        };
+    },
+
+    // Follow cursors until every matching screening is loaded
+    getAll: async (filters: ScreeningFilters = {}) => {
+        const screenings: Screening[] = [];
+        let cursor: string | undefined;
+        do {
+            const page = await screeningsApi.getPage(filters, cursor);
+            screenings.push(...page.items);
+            cursor = page.nextCursor ?? undefined;
+        } while (cursor);
+        return screenings;
+    },
 
     getById: (id: number) => fetchApi<Screening>(`/api/v1/screening/${id}`),
 
+    // Resolve many screenings in one request
+    getByIds: (ids: number[]) =>
+        fetchApi<Screening[]>(`/api/v1/screening/${toQuery({ ids: ids.join(','), limit: ids.length || undefined })}`),
+
     getSeatAvailability: (id: number) =>
         fetchApi<SeatAvailability>(`/api/v1/screening/${id}/seats`),
 
+    getBestSeats: (id: number, count = 1) =>
+        fetchApi<BestSeats>(`/api/v1/screening/${id}/seats/best?count=${count}`),
+
+    // Read the server-sent seat event stream until it ends or is aborted
+    streamSeatAvailability: async (
+        id: number,
+        onEvent: (event: string, data: unknown) => void,
+        signal: AbortSignal,
+    ) => {
+        const token = getToken();
+        const response = await fetch(`${API_BASE_URL}/api/v1/screening/${id}/stream`, {
+            headers: token ? { Authorization: `Bearer ${token}` } : {},
+            signal,
+        });
+
+        if (!response.ok || !response.body) {
+            throw new Error('Failed to open seat stream');
+        }
+
+        const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+        let buffer = '';
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += value;
+
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const frame = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+
+                let event = 'message';
+                let data = '';
+                for (const line of frame.split('\n')) {
+                    if (line.startsWith('event: ')) event = line.slice(7);
+                    else if (line.startsWith('data: ')) data += line.slice(6);
+                }
+                if (data) onEvent(event, JSON.parse(data));
+            }
+        }
+    },
+
     create: (data: ScreeningCreate) =>
         fetchApi<Screening>('/api/v1/screening/', {
             method: 'POST',
@@ -119,6 +231,25 @@ export const screeningsApi = {
         }),
 };
 
+// Seat Holds API
+export const holdsApi = {
+    create: (data: SeatHoldCreate) =>
+        fetchApi<SeatHold>('/api/v1/hold/', {
+            method: 'POST',
+            body: JSON.stringify(data),
+        }),
+
+    extend: (holdId: string) =>
+        fetchApi<SeatHold>(`/api/v1/hold/${holdId}/extend`, {
+            method: 'POST',
+        }),
+
+    release: (holdId: string) =>
+        fetchApi<void>(`/api/v1/hold/${holdId}`, {
+            method: 'DELETE',
+        }),
+};
+
 // Reservations API
 export const reservationsApi = {
     create: (data: ReservationCreate) =>
@@ -127,8 +258,15 @@ export const reservationsApi = {
             body: JSON.stringify(data),
         }),
 
-    getMyReservations: () =>
-        fetchApi<Reservation[]>('/api/v1/reservation/'),
+    createGroup: (data: GroupReservationCreate) =>
+        fetchApi<GroupReservation>('/api/v1/reservation/group', {
+            method: 'POST',
+            body: JSON.stringify(data),
+        }),
+
+    // Optionally include each reservation's screening and movie inline
+    getMyReservations: (expand: Array<'screening' | 'movie'> = []) =>
+        fetchApi<Reservation[]>(`/api/v1/reservation/${toQuery({ expand: expand.join(',') })}`),
 
     getById: (id: number) =>
         fetchApi<Reservation>(`/api/v1/reservation/${id}`),
@@ -161,18 +299,23 @@ export const reservationsApi = {
         }
 
         const blob = await response.blob();
-        const url = window.URL.createObjectURL(new Blob([blob], { type: 'application/pdf' }));
-        const a = document.createElement('a');
-        a.href = url;
-        a.download = `ticket-${id}.pdf`;
-        a.style.display = 'none';
-        document.body.appendChild(a);
-        a.click();
-
-        // Cleanup after a short delay
-        setTimeout(() => {
-            window.URL.revokeObjectURL(url);
-            document.body.removeChild(a);
-        }, 100);
+        saveFile(new Blob([blob], { type: 'application/pdf' }), `ticket-${id}.pdf`);
+    },
+
+    // Download all active tickets as a ZIP (one PDF each) or a single multi-page PDF
+    exportTickets: async (format: 'zip' | 'pdf' = 'zip') => {
+        const token = getToken();
+        const response = await fetch(`${API_BASE_URL}/api/v1/reservation/tickets/export?format=${format}`, {
+            headers: {
+                Authorization: `Bearer ${token}`,
+            },
+        });
+
+        if (!response.ok) {
+            const error = await response.json().catch(() => ({ detail: 'Failed to export tickets' }));
+            throw new Error(error.detail || 'Failed to export tickets');
+        }
+
+        saveFile(await response.blob(), `tickets.${format}`);
     },
 };
@@ -30,21 +30,43 @@ export interface Movie {
     poster_url: string;
     genre: string;
     created_at?: string;
+    screenings?: UpcomingScreening[];
+}
+
+export interface UpcomingScreening {
+    id: number;
+    show_datetime: string;
+    hall: number;
+    total_seats: number;
+    price: string;
+    seats_remaining: number;
 }
 
 export interface Screening {
     id: number;
     movie_id: number;
     show_datetime: string;
+    hall?: number;
     total_seats: number;
+    seats_taken?: number;
     price: string;
     created_at?: string;
     movie?: Movie;
 }
 
+export interface ScreeningFilters {
+    start?: string;
+    end?: string;
+    movie_id?: number;
+    genre?: string;
+    upcoming?: boolean;
+    limit?: number;
+}
+
 export interface ScreeningCreate {
     movie_id: number;
     show_datetime: string;
+    hall?: number;
     total_seats?: number;
     price?: string;
 }
@@ -58,6 +80,29 @@ export interface SeatAvailability {
     available_seats: string[];
 }
 
+export interface SeatDelta {
+    screening_id: number;
+    taken: string[];
+    available: string[];
+}
+
+export interface BestSeats {
+    screening_id: number;
+    seat_numbers: string[];
+}
+
+export interface SeatHoldCreate {
+    screening_id: number;
+    seat_number: string;
+}
+
+export interface SeatHold {
+    hold_id: string;
+    screening_id: number;
+    seat_number: string;
+    expires_at: string;
+}
+
 export interface PaymentRequest {
     card_number: string;
     expiry_month: number;
@@ -78,6 +123,13 @@ export interface ReservationCreate {
     payment: PaymentRequest;
 }
 
+export interface GroupReservationCreate {
+    screening_id: number;
+    seat_numbers?: string[];
+    seat_count?: number;
+    payment: PaymentRequest;
+}
+
 export interface Reservation {
     id: number;
     screening_id: number;
@@ -87,6 +139,13 @@ export interface Reservation {
     created_at?: string;
     cancelled_at?: string;
     payment_info?: PaymentResponse;
+    screening?: Screening | null;
+    movie?: Movie | null;
+}
+
+export interface GroupReservation {
+    reservations: Reservation[];
+    payment_info: PaymentResponse;
 }
 
 export interface ApiError {